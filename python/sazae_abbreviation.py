@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_abbreviation.py
+# Version:      v01
+# Time-stamp:   <2026.10.18-23:44:26-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# 省略したパスのディレクトリの部分（"/u/s/"）を，ディレクトリ（"/usr/share/"，
+# "/usr/src/"等）に展開します。
+#
+# 従来は"/u*/s*/"をglobで展開していたので，途中の全てのディレクトリを
+# 読んでいました。ここでは，ディレクトリを1階層ずつたどり，部分の文字列で
+# 始まる名前だけを，整列した一覧（sazae_directory_cache.py）から二分探索で
+# 取り出すので，関係のないディレクトリは読みません。
+# 部分と同じ名前のディレクトリがあれば（"/usr/s/"の"usr"），それだけを
+# たどります。たどるディレクトリの数は，階層ごとに一定（MAX_BRANCHES）
+# までです。
+#
+# 例：> ./sazae_abbreviation.py /u/s/
+#     /usr/sbin/
+#     /usr/share/
+#     /usr/src/
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+
+from sazae_directory_cache import cache
+from sazae_path_search import split_path
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v01'
+MAX_BRANCHES = 64    # 階層ごとにたどるディレクトリの数
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# ディレクトリdの中で，部分sで始まるディレクトリの名前
+def expand_segment(d, s):
+    if(s in ['', '.', '..']):
+        return [s]
+    try:
+        snapshot = cache.get(d if(d != '') else '.')
+    except OSError:
+        return []
+    e = snapshot.entries.get(s)
+    if((e is not None) and e.is_dir()):
+        # 省略していない部分は，そのまま
+        return [s]
+    i, j = snapshot.range(s)
+    return [n for n in snapshot.names[i:j] if(snapshot.entries[n].is_dir())]
+
+
+# 省略したパスのディレクトリの部分を展開（"/"で終わるもの）
+#   '/u/s/' -> ['/usr/sbin/', '/usr/share/', '/usr/src/']
+def expand_directories(path):
+    root, segments = split_path(path)
+    if(segments[-1] != ''):
+        return []
+    directories = [root]
+    for s in segments[0:-1]:
+        following = []
+        for d in directories:
+            following.extend(d + n + '/' for n in expand_segment(d, s))
+            if(len(following) >= MAX_BRANCHES):
+                break
+        # 組合せが増え過ぎないように，たどるディレクトリを絞る
+        directories = following[0:MAX_BRANCHES]
+        if(not directories):
+            break
+    return directories
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [path]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    if(len(sys.argv) != 2):
+        sys.exit(2)
+    for d in expand_directories(sys.argv[1]):
+        print(d)
@@ -0,0 +1,265 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_aho_corasick.py
+# Version:      v02
+# Time-stamp:   <2026.10.19-02:48:21-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# migemoの正規表現を語に展開して，Aho-Corasickのオートマトンを作り，
+# 1回の走査で，ファイル名が語で始まるか（"$g"がワイルドカードを
+# 含まない場合），語を含むか（"$g"が"*"で終わる場合，"*yama"等）を調べます。
+#
+# 多数の語の選択を正規表現で照合すると，ファイル名の位置ごとに全ての
+# 選択を試すので（"^$g.*(...)"），大きなディレクトリでは遅くなります。
+# トライにした正規表現（sazae_regexp_trie.py）でも，語が多ければ，
+# オートマトンのほうが速く（語が4000の場合，20倍以上），語が少なければ
+# （"tokyo"等），正規表現のほうが速いので，オートマトンを使うのは，
+# ファイル名の数が一定（既定は1000，補完では"-A"）以上で，語が一定
+# （MIN_WORDS）以上の場合だけです。語に展開できない正規表現も，
+# 正規表現で照合します。
+# オートマトンは，デーモンの中では正規表現ごとに保持します。
+#
+# "grep -a -E "^$g($r)""の代わりに，標準入力のファイル名を絞り込みます。
+#
+# 例：> ls -d -- 都道府県/* | ./sazae_aho_corasick.py '都道府県/.*' \
+#         'yama|(山|やま)'
+#     都道府県/富山県.txt
+#     都道府県/山口県.txt
+#     ...
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import re
+import subprocess
+from collections import OrderedDict
+
+from sazae_regexp_trie import get_words, Unsupported
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v02'
+MIN_NAMES = 1000     # この数以上のファイル名なら，オートマトンを使う
+MIN_WORDS = 16       # 正規表現の語がこの数以上なら，オートマトンを使う
+MAX_AUTOMATA = 8
+# grep形式の正規表現の"$g"（文字列と，末尾の".*"）
+GREP_LITERAL = re.compile('((?:\\\\.|[^\\\\.\\[\\]()*+?{}|^$])*)(\\.\\*)?')
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# grep形式の"$g"を，文字列と，語を含むか否かに（扱えなければNone）
+#   '都道府県/.*' -> ('都道府県/', True)
+def split_grep_regexp(g):
+    m = GREP_LITERAL.fullmatch(g)
+    if(not m):
+        return None
+    literal = re.sub('\\\\(.)', '\\1', m.group(1))
+    return literal, (m.group(2) is not None)
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Automaton:
+    """A class matching names against many words at once (Aho-Corasick)"""
+
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.is_word = [False]    # 語の終わり
+        self.is_output = [False]  # 語の終わり（失敗の遷移先を含む）
+        for w in words:
+            self.add(w)
+        self.link()
+        # 語の先頭の文字（これを1つも含まないファイル名は走査しない）
+        self.first = set(self.goto[0])
+
+    def add(self, word):
+        state = 0
+        for c in word:
+            following = self.goto[state].get(c)
+            if(following is None):
+                following = len(self.goto)
+                self.goto[state][c] = following
+                self.goto.append({})
+                self.fail.append(0)
+                self.is_word.append(False)
+                self.is_output.append(False)
+            state = following
+        self.is_word[state] = True
+        self.is_output[state] = True
+
+    # 失敗の遷移（幅優先）
+    def link(self):
+        queue = list(self.goto[0].values())
+        i = 0
+        while(i < len(queue)):
+            state = queue[i]
+            i += 1
+            for c, following in self.goto[state].items():
+                queue.append(following)
+                f = self.fail[state]
+                while((f != 0) and (c not in self.goto[f])):
+                    f = self.fail[f]
+                f = self.goto[f].get(c, 0)
+                self.fail[following] = f
+                if(self.is_output[f]):
+                    self.is_output[following] = True
+
+    # sが語で始まるか
+    def starts(self, s):
+        if(self.is_word[0]):
+            return True
+        state = 0
+        for c in s:
+            state = self.goto[state].get(c)
+            if(state is None):
+                return False
+            if(self.is_word[state]):
+                return True
+        return False
+
+    # sが語を含むか
+    def contains(self, s):
+        if(self.is_output[0]):
+            return True
+        if(self.first.isdisjoint(s)):
+            return False
+        goto = self.goto
+        fail = self.fail
+        is_output = self.is_output
+        state = 0
+        for c in s:
+            while((state != 0) and (c not in goto[state])):
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if(is_output[state]):
+                return True
+        return False
+
+
+class AhoCorasickFilter:
+    """A class choosing the automaton or the regexp to match the names"""
+
+    # literalは"$g"の文字列，is_containingは"$g"が"*"で終わるか否か
+    # thresholdは，オートマトンを使うファイル名の数
+    def __init__(self, literal, is_containing, regexp, threshold=MIN_NAMES):
+        self.literal = literal
+        self.is_containing = is_containing
+        self.regexp = regexp
+        self.threshold = threshold
+
+    def filter(self, names, matcher):
+        automaton = None
+        if(len(names) >= self.threshold):
+            automaton = get_automaton(self.regexp)
+        if(automaton is None):
+            return [n for n in names if matcher.match(n)]
+        i = len(self.literal)
+        p = self.literal
+        if(self.is_containing):
+            return [n for n in names
+                    if(n.startswith(p) and automaton.contains(n[i:]))]
+        return [n for n in names
+                if(n.startswith(p) and automaton.starts(n[i:]))]
+
+
+# 正規表現 -> オートマトン（語に展開できないか，語が少なければNone）
+automata = OrderedDict()
+
+
+def get_automaton(regexp):
+    if(regexp in automata):
+        automata.move_to_end(regexp)
+        return automata[regexp]
+    try:
+        words = get_words(regexp)
+    except Unsupported:
+        words = []
+    automaton = Automaton(words) if(len(words) >= MIN_WORDS) else None
+    automata[regexp] = automaton
+    while(len(automata) > MAX_AUTOMATA):
+        automata.popitem(last=False)
+    return automaton
+
+
+# 標準入力のファイル名のうち，"^$g($r)"に一致するもの
+def main(args, stdin):
+    if(len(args) != 2):
+        return 2, ''
+    g, r = args
+    names = stdin.splitlines()
+    regexp = '^' + g + '(' + r + ')'
+    try:
+        if(re.search('\\[[:=.]', regexp)):
+            raise re.error(regexp)
+        matcher = re.compile(regexp)
+    except re.error:
+        # pythonのreで扱えない正規表現（"[[:alpha:]]"等）は，grepで照合
+        p = subprocess.run(['grep', '-a', '-E', regexp],
+                           input=stdin.encode('utf-8', 'surrogateescape'),
+                           stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        return p.returncode, p.stdout.decode('utf-8', 'surrogateescape')
+    split = split_grep_regexp(g)
+    if(split is None):
+        found = [n for n in names if matcher.match(n)]
+    else:
+        literal, is_containing = split
+        # ファイル名の数は，シェルで比べてある（sazae_aho_corasick_threshold）
+        found = AhoCorasickFilter(literal, is_containing, '(' + r + ')',
+                                  0).filter(names, matcher)
+    if(not found):
+        return 1, ''
+    return 0, '\n'.join(found) + '\n'
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [$g] [$r]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    status, output = main(sys.argv[1:], sys.stdin.read())
+    sys.stdout.write(output)
+    sys.exit(status)
@@ -2,8 +2,8 @@
 # coding: utf-8
 #
 # Name:         ~/.zshrc-sazae/python/sazae_analyze_buffer.py
-# Version:      v21
-# Time-stamp:   <2026.08.15-13:28:18-JST>
+# Version:      v23
+# Time-stamp:   <2026.10.18-12:15:31-JST>
 #
 # Copyright (C) 2017-2026  Seiichiro HATA
 #
@@ -90,6 +90,17 @@
 #     ''
 #     'http://\\nhttps://'
 #     'END'
+#
+# 例：> ./sazae_analyse_buffer.py -t 'mv "ab ; cd/ef' 'gh ijkl'
+#     typeset -g sazae_new_buffer_A='mv '
+#     typeset -g sazae_new_buffer_B='"ab ; cd/efgh '
+#     typeset -g sazae_new_buffer_M='ijkl'
+#     typeset -g sazae_new_buffer_Q='"'
+#     typeset -g sazae_new_buffer_C=''
+#     typeset -g sazae_mode='file'
+#     typeset -g sazae_regexp=''
+#     typeset -g sazae_permission=''
+#     typeset -g sazae_plus=''
 
 
 ############################################################
@@ -107,26 +118,30 @@ import subprocess
 ############################################################
 
 
-VERSION = 'v20'
+VERSION = 'v23'
 PYTHON_VERSION = sys.version_info[0]
 NOT_ESCAPED = '^((.*[^\\\\])?(\\\\\\\\)*)?'
 
 
 ############################################################
-# HELP AND VERSION
+# FUNCTIONS
 ############################################################
 
 
-if(len(sys.argv) == 2):
-    if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
-        print('Usage: ' + sys.argv[0] + ' [left part] [right part]')
-        print('Options:')
-        print('  -h, --help            show this message and exit')
-        print('  -v, --version         show version number and exit')
-        exit(0)
-    elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
-        print(sys.argv[0] + ' ' + VERSION)
-        exit(0)
+# 改行を含むバッファの符号化（zshrcと同じ規則）
+#   '%' -> '-%', '@' -> '+%', '\n' -> '@'
+def encode_buffer(s):
+    return s.replace('%', '-%').replace('@', '+%').replace('\n', '@')
+
+
+# 符号化したバッファの復号
+def decode_buffer(s):
+    return s.replace('@', '\n').replace('+%', '@').replace('-%', '%')
+
+
+# zshのevalで元に戻る引用（${(qq)...}と同じ形式）
+def quote(s):
+    return "'" + s.replace("'", "'\\''") + "'"
 
 
 ############################################################
@@ -1241,13 +1256,51 @@ class Buffer:
         # 8. end mark (Without this, blank lines will disappear.)
         print('END')
 
+    # zshで1回のevalで読み込める形式
+    def output_typeset(self):
+        _parts = [
+            # front part + command part
+            ['sazae_new_buffer_A',
+             decode_buffer(self.buf_array_out[0] + self.buf_array_out[1])],
+            # complementation part (base, migemo, quotation)
+            ['sazae_new_buffer_B', decode_buffer(self.buf_array_out[2])],
+            ['sazae_new_buffer_M', decode_buffer(self.buf_array_out[3])],
+            ['sazae_new_buffer_Q', decode_buffer(self.unclosed_signs[::-1])],
+            # rear part
+            ['sazae_new_buffer_C', decode_buffer(self.buf_array_out[4])],
+            ['sazae_mode', self.mode],
+            ['sazae_regexp', self.regexp],
+            ['sazae_permission', self.permission],
+            ['sazae_plus', self.plus]]
+        for _name, _value in _parts:
+            print('typeset -g ' + _name + '=' + quote(_value))
+
 
 ############################################################
 # MAIN
 
 
 if __name__ == '__main__':
-    buf = Buffer(sys.argv)
-    buf.analyse_buffer()
-    buf.get_mode()
-    buf.output()
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [left part] [right part]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -t                    output for eval of zsh')
+            print('                        (the parts are not encoded)')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    if((len(sys.argv) == 4) and (sys.argv[1] == '-t')):
+        buf = Buffer(['', encode_buffer(sys.argv[2]),
+                      encode_buffer(sys.argv[3])])
+        buf.analyse_buffer()
+        buf.get_mode()
+        buf.output_typeset()
+    else:
+        buf = Buffer(sys.argv)
+        buf.analyse_buffer()
+        buf.get_mode()
+        buf.output()
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_benchmark_regexp.py
+# Version:      v01
+# Time-stamp:   <2026.10.18-18:21:06-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# テストデータ（depot/test-data.tgz）のファイル名で，migemoの正規表現を
+# トライにする前と後（sazae_regexp_trie.py）の長さと照合の時間を比べます。
+#
+# 照合は，pythonのreと（あれば）grep -Eで，ファイル名を"-n"回ずつ
+# 照合した時間です。前と後で一致するファイル名が異なれば，"NG"と表示します。
+#
+# 例：> ./sazae_benchmark_regexp.py \
+#         -m 'cmigemo -q -d /usr/share/cmigemo/utf-8/migemo-dict' a yama
+#     key     length      re(ms)  grep(ms)
+#     a       130921       707.6    5833.9
+#             64689        215.5      50.2     OK
+#     yama    2688          10.2       6.0
+#             1973           6.7       2.9     OK
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+import time
+import shutil
+import tarfile
+import tempfile
+import subprocess
+
+from sazae_migemo import run_once
+from sazae_migemo_engine import MigemoEngine
+from sazae_regexp_trie import optimize, escape
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v01'
+TEST_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', 'depot', 'test-data.tgz')
+KEYS = ['a', 'ka', 'to', 'yama', 'shima', 'fuku', 'kawa', 'oosaka']
+REPEAT = 1000
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# テストデータのファイル名
+def get_names(path):
+    directory = tempfile.mkdtemp()
+    try:
+        with tarfile.open(path) as t:
+            t.extractall(directory)
+        names = []
+        for _, directories, files in os.walk(directory):
+            names.extend(directories)
+            names.extend(files)
+    finally:
+        shutil.rmtree(directory)
+    return sorted(names)
+
+
+# トライにする前の正規表現
+def get_flat_regexp(engine, key):
+    pattern = ''
+    for segment in re.findall('[A-Z]?[^A-Z]*', key):
+        if(segment != ''):
+            pattern = pattern + '(' + '|'.join(
+                escape(w) for w in engine.get_words(segment)) + ')'
+    return pattern
+
+
+def time_re(pattern, names, repeat):
+    start = time.time()
+    matcher = re.compile('^' + pattern)
+    for _ in range(repeat):
+        found = [n for n in names if matcher.match(n)]
+    return (time.time() - start) * 1000, found
+
+
+def time_grep(pattern, names, repeat):
+    if(shutil.which('grep') is None):
+        return None
+    lines = ('\n'.join(names) + '\n').encode('utf-8') * repeat
+    # 長い正規表現は引数で渡せないので，ファイルで渡す
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8') as f:
+        f.write('^' + pattern + '\n')
+        f.flush()
+        start = time.time()
+        subprocess.run(['grep', '-E', '-f', f.name], input=lines,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return (time.time() - start) * 1000
+
+
+def print_row(key, pattern, names, repeat, expected=None):
+    t, found = time_re(pattern, names, repeat)
+    g = time_grep(pattern, names, repeat)
+    row = '%-8s%-10d%8.1f' % (key, len(pattern), t)
+    row = row + ('%10.1f' % g if(g is not None) else '%10s' % '-')
+    if(expected is not None):
+        row = row + ('     OK' if(found == expected) else '     NG')
+    print(row)
+    return found
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option] [string...]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -m <command>          specify migemo command')
+            print('  -D <dictionary>       specify migemo-dict (no command)')
+            print('  -t <path>             specify the test data')
+            print('  -n <number>           number of times to match')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    migemo_command = ''
+    migemo_dictionary = ''
+    test_data = TEST_DATA
+    repeat = REPEAT
+    keys = []
+    args = sys.argv[1:]
+    while(args):
+        a = args.pop(0)
+        if(a == '-m' and args):
+            migemo_command = args.pop(0)
+        elif(a == '-D' and args):
+            migemo_dictionary = args.pop(0)
+        elif(a == '-t' and args):
+            test_data = args.pop(0)
+        elif(a == '-n' and args):
+            repeat = int(args.pop(0))
+        else:
+            keys.append(a)
+    if((migemo_command == '') and (migemo_dictionary == '')):
+        sys.stderr.write(sys.argv[0] + ': specify -m or -D\n')
+        sys.exit(2)
+    engine = None
+    if(migemo_dictionary != ''):
+        engine = MigemoEngine(migemo_dictionary)
+    names = get_names(test_data)
+    print('%-8s%-10s%8s%10s' % ('key', 'length', 're(ms)', 'grep(ms)'))
+    for key in keys or KEYS:
+        if(engine is not None):
+            before = get_flat_regexp(engine, key)
+        else:
+            before = run_once(migemo_command, key)
+        if(before == ''):
+            continue
+        expected = print_row(key, before, names, repeat)
+        print_row('', optimize(before), names, repeat, expected)
@@ -2,10 +2,10 @@
 # coding: utf-8
 #
 # Name:         ~/.zshrc-sazae/sazae_check_candidates.py
-# Version:      v09
-# Time-stamp:   <2021.10.03-10:40:30-JST>
+# Version:      v11
+# Time-stamp:   <2026.10.18-22:24:50-JST>
 #
-# Copyright (C) 2017-2021  Seiichiro HATA
+# Copyright (C) 2017-2026  Seiichiro HATA
 #
 # This program is free software: you can redistribute it and/or modify
 # it under the terms of the GNU General Public License as published by
@@ -64,51 +64,16 @@ import re
 ############################################################
 
 
-VERSION = 'v09'
-if((len(sys.argv) >= 3) and (sys.argv[1] == '-d')):
-    PWD = sys.argv[2]
-    del sys.argv[1:3]
-else:
-    PWD = ''
-if(PWD == ''):
-    PWD = os.getcwd()
-MODE = sys.argv[1]
-REGEXP = sys.argv[2]
-PERMISSION = sys.argv[3]
+VERSION = 'v11'
 
 
 ############################################################
-# HELP AND VERSION
+# FUNCTIONS
 ############################################################
 
 
-if(len(sys.argv) == 2):
-    if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
-        print('Usage: (stdout) | ' + sys.argv[0] + ' [mode]')
-        print('Options:')
-        print('  -h, --help            show this message and exit')
-        print('  -v, --version         show version number and exit')
-        print('  -d <path>             specify the current directory')
-        exit(0)
-    elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
-        print(sys.argv[0] + ' ' + VERSION)
-        exit(0)
-
-
-############################################################
-# GET CANDIDATES
-############################################################
-
-
-candidates = sys.stdin.read().splitlines()
-
-
-############################################################
-# CHECK CANDIDATES
-############################################################
-
-
-for i, c in enumerate(candidates):
+# 補完候補のエスケープ
+def escape(c):
     c_esc = c
     c_esc = c_esc.replace('\\', '\\\\')  # Convert first
     c_esc = c_esc.replace('\t', '\\\t')
@@ -144,54 +109,128 @@ for i, c in enumerate(candidates):
     c_esc = c_esc.replace('|', '\\|')
     c_esc = c_esc.replace('}', '\\}')
     # c_esc = c_esc.replace('~', '\\~')
-    if(os.path.isdir(c)):
-        if((MODE == 'Link') or (MODE == 'Dire') or (MODE == 'File')):
+    return c_esc
+
+
+# パーミッションの文字列（'000110100100'の形式）
+#   mod_dがあれば，statしない
+def get_permission(c, mod_d=None):
+    if(mod_d is None):
+        mod_d = os.stat(c).st_mode
+    mod_o = \
+        str(int(mod_d / (8**3)) % 8) + \
+        str(int(mod_d / (8**2)) % 8) + \
+        str(int(mod_d / (8**1)) % 8) + \
+        str(int(mod_d / (8**0)) % 8)
+    per = ''
+    for i in mod_o:
+        per = per + \
+              str(int(int(i) / (2**2)) % 2) + \
+              str(int(int(i) / (2**1)) % 2) + \
+              str(int(int(i) / (2**0)) % 2)
+    return per
+
+
+# 補完候補の形式をチェックし，エスケープして返す
+def check_candidates(candidates, mode, regexp, permission, pwd=''):
+    if(pwd == ''):
+        pwd = os.getcwd()
+    checked = []
+    for c in candidates:
+        c_esc = check_candidate(c, os.path.isdir(c), os.path.islink(c),
+                                mode, regexp, permission, pwd)
+        if(c_esc is not None):
+            checked.append(c_esc)
+    return checked
+
+
+# 1つの補完候補の形式をチェック（候補でなければNone）
+#   is_directoryはリンク先がディレクトリの場合も真，get_modeはstatの代わり
+def check_candidate(c, is_directory, is_link, mode, regexp, permission, pwd,
+                    get_mode=None):
+    c_esc = escape(c)
+    if(is_directory):
+        if((mode == 'Link') or (mode == 'Dire') or (mode == 'File')):
             if(re.match('^/', c)):
-                path = PWD + '/NOT_CURRENT_DIRECTORY'
+                path = pwd + '/NOT_CURRENT_DIRECTORY'
                 # path = c
             else:
-                path = PWD + '/' + c
+                path = pwd + '/' + c
             if(not re.match('^(.*)//[^/]*$', path)):
                 path = re.sub('/+', '/', path)  # "..//a" -> "..//ab"
             # path = re.sub('/+$', '', path)  # Impossible
             while(re.match('^(.*)/[^/]+/\\.\\./', path)):
                 path = re.sub('/[^/]+/\\.\\./', '/', path, 1)
         else:
-            path = PWD + '/NOT_CURRENT_DIRECTORY'
-        if(path != PWD):
+            path = pwd + '/NOT_CURRENT_DIRECTORY'
+        if(path != pwd):
             if(c == '/'):
-                print(c_esc)
-            else:
-                print(c_esc + '/')
-    elif(os.path.islink(c)):
-        if((MODE != 'dire') and (MODE != 'Dire')):
-            if(os.path.isdir(c)):
-                print(c_esc + '/')
+                return c_esc
             else:
-                if(re.match(REGEXP, c)):
-                    print(c_esc)
+                return c_esc + '/'
+    elif(is_link):
+        if((mode != 'dire') and (mode != 'Dire')):
+            if(re.match(regexp, c)):
+                return c_esc
     else:
-        if((MODE != 'dire') and (MODE != 'Dire') and
-           (MODE != 'link') and (MODE != 'Link')):
-            if(re.match(REGEXP, c)):
-                if(PERMISSION == ''):
-                    print(c_esc)
+        if((mode != 'dire') and (mode != 'Dire') and
+           (mode != 'link') and (mode != 'Link')):
+            if(re.match(regexp, c)):
+                if(permission == ''):
+                    return c_esc
                 else:
-                    mod_d = os.stat(c).st_mode
-                    mod_o = \
-                        str(int(mod_d / (8**3)) % 8) + \
-                        str(int(mod_d / (8**2)) % 8) + \
-                        str(int(mod_d / (8**1)) % 8) + \
-                        str(int(mod_d / (8**0)) % 8)
-                    per = ''
-                    for i in mod_o:
-                        per = per + \
-                              str(int(int(i) / (2**2)) % 2) + \
-                              str(int(int(i) / (2**1)) % 2) + \
-                              str(int(int(i) / (2**0)) % 2)
-                    if(re.match('^!', PERMISSION)):
-                        if(not re.match(PERMISSION, '!' + per)):
-                            print(c_esc)
+                    per = get_permission(c, get_mode() if(get_mode)
+                                         else None)
+                    if(re.match('^!', permission)):
+                        if(not re.match(permission, '!' + per)):
+                            return c_esc
                     else:
-                        if(re.match(PERMISSION, per)):
-                            print(c_esc)
+                        if(re.match(permission, per)):
+                            return c_esc
+    return None
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+
+    ############################################################
+    # HELP AND VERSION
+
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: (stdout) | ' + sys.argv[0] + ' [mode]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -d <path>             specify the current directory')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+
+    ############################################################
+    # GET ARGUMENTS
+
+    if((len(sys.argv) >= 3) and (sys.argv[1] == '-d')):
+        PWD = sys.argv[2]
+        del sys.argv[1:3]
+    else:
+        PWD = ''
+    MODE = sys.argv[1]
+    REGEXP = sys.argv[2]
+    PERMISSION = sys.argv[3]
+
+    ############################################################
+    # GET CANDIDATES
+
+    candidates = sys.stdin.read().splitlines()
+
+    ############################################################
+    # CHECK CANDIDATES
+
+    for c_esc in check_candidates(candidates, MODE, REGEXP, PERMISSION, PWD):
+        print(c_esc)
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_compare_romaji.py
+# Version:      v01
+# Time-stamp:   <2026.10.19-01:58:44-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ローマ字の変換（sazae_romaji.py）を，有限オートマトンにする前の変換
+# （1文字ずつ最長一致で表を引く，sazae_migemo_engine.py v04のもの）と
+# 比べます。
+#
+# 表（CASES）の入力と，短いローマ字の全ての組合せ（"-n"文字まで）で，
+# 前と後の出力（展開の並びは，重複を除いたもの）が同じかを確かめます。
+# 前の変換が扱わなかったもの（"n'"，"tch"，長音の記号）は，表に後の出力を
+# 書いておき，それと比べます。異なるものがあれば"NG"と表示し，終了
+# ステータスを1にします。
+#
+# 例：> ./sazae_compare_romaji.py
+#     yam          OK
+#     matc         OK
+#     ...
+#     20349 cases, 0 NG
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import itertools
+
+from sazae_romaji import ROMAJI, CONSONANTS, romaji_to_hiragana
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v01'
+LENGTH = 3       # 全ての組合せを作るローマ字の長さ
+LETTERS = "aiueokstnhmyrwgzjdbpcfvlx-'"
+
+# 入力 -> 後の出力（Noneなら，前の変換と同じ）
+CASES = {'yam': None,
+         'kyo': None,
+         'toukyou': None,
+         'sh': None,
+         'ts': None,
+         'n': None,
+         'kann': None,
+         'kanni': None,
+         'kanna': None,
+         'shinbun': None,
+         'kitte': None,
+         'matt': None,
+         'ky': None,
+         'xts': None,
+         'akk': None,
+         'tyotto': None,
+         'konnnichiha': None,
+         'ra-men': None,
+         'ABC': None,
+         'x1y': None,
+         # 前の変換が扱わなかったもの
+         "kan'i": ['かんい'],
+         "n'": ['ん'],
+         'matcha': ['まっちゃ'],
+         'ketchupa': ['けっちゅぱ'],
+         'matc': ['まっち', 'まっちゃ', 'まっちゅ', 'まっちぇ', 'まっちょ',
+                  'まっちぃ'],
+         'tc': ['っち', 'っちゃ', 'っちゅ', 'っちぇ', 'っちょ', 'っちぃ'],
+         'tōkyō': ['とうきょう'],
+         'kâ': ['かあ']}
+
+# 前の変換の表（"n'"のないもの）
+OLD_ROMAJI = dict((k, v) for k, v in ROMAJI.items() if(k != "n'"))
+OLD_MAX_ROMAJI = max(len(k) for k in OLD_ROMAJI)
+OLD_ROMAJI_PREFIXES = set(k[0:i] for k in OLD_ROMAJI
+                          for i in range(1, len(k)))
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 有限オートマトンにする前の変換（最長一致）
+def old_romaji_to_hiragana(s):
+    s = s.lower()
+    h = ''
+    i = 0
+    while(i < len(s)):
+        rest = s[i:]
+        # 促音
+        if((len(rest) > 1) and (rest[0] == rest[1]) and
+           (rest[0] in CONSONANTS) and (rest[0] != 'n')):
+            h = h + 'っ'
+            i += 1
+            continue
+        for j in range(min(OLD_MAX_ROMAJI, len(rest)), 0, -1):
+            if(rest[0:j] in OLD_ROMAJI):
+                h = h + OLD_ROMAJI[rest[0:j]]
+                i += j
+                break
+        else:
+            if(rest in OLD_ROMAJI_PREFIXES):
+                # 入力の途中
+                expansions = [h + OLD_ROMAJI[k] for k in OLD_ROMAJI
+                              if k.startswith(rest)]
+                if(rest == 'n'):
+                    expansions.insert(0, h + 'ん')
+                return expansions
+            if(rest[0] == 'n'):
+                h = h + 'ん'
+            else:
+                h = h + rest[0]
+            i += 1
+    return [h]
+
+
+# 重複を除いた並び（順序は保つ）
+def unique(words):
+    found = []
+    for w in words:
+        if(w not in found):
+            found.append(w)
+    return found
+
+
+# 前の変換が扱わなかった入力か
+def is_new_case(s):
+    return ("n'" in s) or ('tc' in s)
+
+
+# 比べる入力（表と，短いローマ字の全ての組合せ）
+def get_cases(length):
+    cases = dict(CASES)
+    for n in range(1, length + 1):
+        for t in itertools.product(LETTERS, repeat=n):
+            s = ''.join(t)
+            if((s not in cases) and (not is_new_case(s))):
+                cases[s] = None
+    return cases
+
+
+# 入力を比べ，異なる入力の数を返す（verboseなら，shownの入力を全て表示）
+def compare(cases, shown, verbose=True):
+    ng = 0
+    for s, expected in cases.items():
+        if(expected is None):
+            expected = unique(old_romaji_to_hiragana(s))
+        found = romaji_to_hiragana(s)
+        if(found != expected):
+            ng += 1
+            print('%-12s NG' % s)
+            print('    expected: ' + ' '.join(expected))
+            print('    found:    ' + ' '.join(found))
+        elif(verbose and (s in shown)):
+            print('%-12s OK' % s)
+    return ng
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option] [string...]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -n <number>           length of all the combinations')
+            print('  -q                    show only NG')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    length = LENGTH
+    verbose = True
+    keys = []
+    args = sys.argv[1:]
+    while(args):
+        a = args.pop(0)
+        if(a == '-n' and args):
+            length = int(args.pop(0))
+        elif(a == '-q'):
+            verbose = False
+        else:
+            keys.append(a)
+    if(keys):
+        cases = dict((k, CASES.get(k)) for k in keys)
+    else:
+        cases = get_cases(length)
+    ng = compare(cases, keys or CASES, verbose)
+    print('%d cases, %d NG' % (len(cases), ng))
+    sys.exit(1 if(ng > 0) else 0)
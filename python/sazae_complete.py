@@ -0,0 +1,671 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_complete.py
+# Version:      v21
+# Time-stamp:   <2026.10.19-04:17:09-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# コマンドライン（バッファ）を受け取り，1回の起動で補完をします。
+#
+# zshrcの"_sazae-main-core"が，複数のスクリプトとコマンドを組み合わせて
+# 行っていた処理（バッファの解析，展開，migemo，候補の絞込み，エスケープ，
+# 共通部分の抽出）を，同じプロセスの中で行い，次を表示します。
+#   1 処理（zle, none, shell, list, set, part, beep）
+#   2 補完候補の数
+#   3 前部分
+#   4 後部分
+#   5 新しい左バッファ
+#   6 新しい右バッファ
+#   7 以降 補完候補
+# 3から6は，zshrcと同じ規則で改行等を符号化しています。
+#
+# 補完（-c，-r）では，候補の数が一定（-n）に達し，候補の共通部分が
+# 入力した文字列（$b）より長くならないことが確かになれば，残りの候補を
+# 作らずに，新しいバッファを設定します（part）。残りの候補は，zshrcが，
+# 候補を順に選ぶ時に，一覧（-l）で改めて求めます。
+#
+# 期限（-t）を付ければ，ネットワークのファイルシステム（NFS，sshfs等）では，
+# 期限までに作った候補だけで補完します（part）。期限のない，省略した
+# パス等の他の方法と，展開（glob）は，そのディレクトリでは試みません。
+#
+# 処理の意味
+#   zle   zshの本来の補完を使う
+#   none  何もしない
+#   shell 変数や部分コマンドを含むので，zshrcの従来の処理を使う
+#   list  補完候補を表示する
+#   set   新しいバッファを設定する
+#   part  新しいバッファを設定する（補完候補は途中まで）
+#   beep  補完に失敗した
+#
+# 例：> ./sazae_complete.py -m 'cmigemo -q -d /usr/share/cmigemo/utf-8/migemo-dict' \
+#         -c 'cat 都道府県/yama' ''
+#     set
+#     3
+#     cat
+#
+#     cat 都道府県/山
+#
+#     都道府県/山口県.txt
+#     都道府県/山形県.txt
+#     都道府県/山梨県.txt
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+import glob
+import time
+
+from sazae_analyse_buffer import Buffer, encode_buffer, decode_buffer
+from sazae_check_candidates import check_candidates, escape
+from sazae_extract_common_part import get_common_part
+from sazae_prefilter import Prefilter
+from sazae_aho_corasick import AhoCorasickFilter, MIN_NAMES
+from sazae_path_search import PathSearch
+from sazae_enumerate import Enumerator
+from sazae_abbreviation import expand_directories
+from sazae_deadline import Task, is_remote, is_busy
+import sazae_migemo
+import sazae_romaji
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v21'
+NOT_ESCAPED = '^((.*[^\\\\])?(\\\\\\\\)*)?'
+ZLE_MODES = ['comm', 'opti', 'envi', 'user', 'lang', 'arch', 'norm']
+SHELL_MODES = ['moun', '_gi1', '_gi2']
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# シェルの語を，文字と引用の有無の組に分解
+#   'a\ b"c*"*' -> [('a', True), (' ', True), ('b', False), ...]
+def unquote(word):
+    tokens = []
+    quote = ''
+    i = 0
+    while(i < len(word)):
+        c = word[i]
+        if(quote == "'"):
+            if(c == "'"):
+                quote = ''
+            else:
+                tokens.append((c, True))
+        elif(quote == '"'):
+            if(c == '"'):
+                quote = ''
+            elif((c == '\\') and (i + 1 < len(word)) and
+                 (word[i + 1] in '\\"$`')):
+                i += 1
+                tokens.append((word[i], True))
+            else:
+                tokens.append((c, True))
+        else:
+            if(c in '\'"'):
+                quote = c
+            elif(c == '\\'):
+                if(i + 1 < len(word)):
+                    i += 1
+                    tokens.append((word[i], True))
+            else:
+                tokens.append((c, False))
+        i += 1
+    return tokens
+
+
+# globのパターン
+def to_glob(tokens):
+    pattern = ''
+    for c, is_quoted in tokens:
+        if(is_quoted or (c not in '*?')):
+            pattern = pattern + glob.escape(c)
+        else:
+            pattern = pattern + c
+    return pattern
+
+
+# pythonの正規表現
+def to_regexp(tokens):
+    regexp = ''
+    for c, is_quoted in tokens:
+        if(is_quoted or (c not in '*?')):
+            regexp = regexp + re.escape(c)
+        elif(c == '*'):
+            regexp = regexp + '.*'
+        else:
+            regexp = regexp + '.'
+    return regexp
+
+
+# ホームディレクトリの展開
+def expand_tilde(b):
+    m = re.match('^~([_a-z][_0-9a-z]*)?', b)
+    home = os.path.expanduser(m.group(0))
+    if(home == m.group(0)):
+        return b
+    return re.sub('/+$', '/', home + b[len(m.group(0)):])
+
+
+# migemoの正規表現（デーモンの中では，常駐させたmigemoを使う）
+def get_migemo_regexp(key, migemo_command, migemo_dictionary='',
+                      directory=None):
+    return sazae_migemo.query(migemo_command, key, migemo_dictionary,
+                              directory)
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Completion:
+    """A class completing a buffer in one process"""
+
+    ########################################
+    # CONSTRUCTOR
+    ########################################
+
+    def __init__(self, lbuffer, rbuffer, widget='-c', migemo_command='',
+                 migemo_dictionary='', use_vocabulary=False,
+                 use_index=False, use_kana=False, fuzzy_distance=0,
+                 limit=0, timeout=0, aho_corasick_threshold=MIN_NAMES):
+        self.lbuffer = lbuffer
+        self.rbuffer = rbuffer
+        # -l (list), -c (complete), -r (reverse)
+        self.widget = widget
+        self.migemo_command = migemo_command
+        self.migemo_dictionary = migemo_dictionary
+        self.use_vocabulary = use_vocabulary
+        self.use_index = use_index
+        self.use_kana = use_kana
+        # 打ち間違いを許す編集距離（0なら許さない）
+        self.fuzzy_distance = fuzzy_distance
+        # 共通部分が決まった後に作る候補の数（0なら全て作る）
+        self.limit = limit
+        # 候補を途中まで作ったか
+        self.is_partial = False
+        # ネットワークのファイルシステムの期限（秒，0なら期限なし）
+        self.timeout = timeout
+        self.deadline = None
+        # 期限までに候補を作り終えなかったか
+        self.is_truncated = False
+        # Aho-Corasickのオートマトンを使うファイル名の数
+        self.aho_corasick_threshold = aho_corasick_threshold
+        # migemoの正規表現（全体と空白後，"/u/s/e"の補完で，同じ文字列を使う）
+        self.migemo_regexps = {}
+        # zle, none, shell, list, set, beep
+        self.action = 'none'
+        self.number = -1
+        # front part, rear part
+        self.buffer_a = ''
+        self.buffer_c = ''
+        # new left buffer, new right buffer
+        self.buffer_l = ''
+        self.buffer_r = ''
+        self.candidates = []
+        self.mode = ''
+        self.regexp = ''
+        self.permission = ''
+        self.plus = ''
+
+    ########################################
+    # COMPLETE
+    ########################################
+
+    def complete(self):
+        if(self.timeout > 0):
+            self.deadline = time.monotonic() + self.timeout
+        buf = Buffer(['', encode_buffer(self.lbuffer),
+                      encode_buffer(self.rbuffer)])
+        buf.analyse_buffer()
+        buf.get_mode()
+        a = decode_buffer(buf.buf_array_out[0] + buf.buf_array_out[1])
+        b = decode_buffer(buf.buf_array_out[2])
+        m = decode_buffer(buf.buf_array_out[3])
+        q = decode_buffer(buf.unclosed_signs[::-1])
+        self.buffer_a = a
+        self.buffer_c = decode_buffer(buf.buf_array_out[4])
+        self.mode = buf.mode
+        self.regexp = buf.regexp
+        self.permission = buf.permission
+        self.plus = buf.plus
+        # 補完しない
+        if(self.mode == 'igno'):
+            self.action = 'none'
+            return
+        # zshの本来の補完
+        if(self.mode in ZLE_MODES):
+            self.action = 'zle'
+            return
+        # 末尾が「\」ならば何もしない
+        if(re.match(NOT_ESCAPED + '\\\\$', b)):
+            self.action = 'none'
+            return
+        # マウントポイントとgitは，従来の処理
+        if(self.mode in SHELL_MODES):
+            self.action = 'shell'
+            return
+        # ホームディレクトリの展開
+        if(re.match('^~', b)):
+            b = expand_tilde(b)
+        # シェル変数・環境変数・部分コマンドは，従来の処理
+        if(re.search('\\$[_a-zA-Z{(]', b) or ('`' in b)):
+            self.action = 'shell'
+            return
+        # 空白の前後
+        i = ''
+        j = ''
+        s = re.match('^(.*\\s)(.*)$', b)
+        if(s):
+            i = s.group(1)
+            j = s.group(2)
+        # 展開
+        if(b + q + m != ''):
+            # 全体の展開
+            if(self._try_expansion(b + q + m, '')):
+                return
+            # 空白後の展開
+            if((i + j != '') and self._try_expansion(j + m, i)):
+                return
+        # 全体の補完
+        if(self._try_completion(b + q, m, '')):
+            return
+        # 空白後の補完
+        if((i + j != '') and self._try_completion(j, m, i)):
+            return
+        # 展開も補完も失敗
+        self.action = 'beep'
+        self.number = 0
+
+    def _try_expansion(self, word, space):
+        if(self.is_remote_word(word)):
+            # ネットワークのファイルシステムでは，期限のないglobをしない
+            return False
+        candidates = self.expand(word)
+        if(len(candidates) < 2):
+            return False
+        self.buffer_a = self.buffer_a + space
+        self.candidates = candidates
+        if(self.widget == '-l'):
+            self.action = 'list'
+            self.number = len(candidates)
+        else:
+            self.action = 'set'
+            self.number = 1
+            self.buffer_l = self.buffer_a + ''.join(c + ' ' for c in candidates)
+            self.buffer_r = self.buffer_c
+        return True
+
+    def _try_completion(self, base, key, space):
+        candidates = self.collect_candidates(base, key)
+        if(self.is_truncated):
+            # 期限で打ち切ったので，他の方法は試みない（どれも期限がない）
+            if(len(candidates) == 0):
+                self.action = 'beep'
+                self.number = 0
+                return True
+        elif(not self.is_remote_word(base)):
+            if(len(candidates) == 0):
+                # "/u/s/e"で"/usr/share/emacs"の補完を試みる
+                candidates = self.search_abbreviation(base, key)
+            if(len(candidates) == 0):
+                # "/ho-mu/kawa"で"/ホーム/kawai"の補完を試みる
+                candidates = self.search_path(base, key)
+            if((len(candidates) == 0) and (self.fuzzy_distance > 0)):
+                # "yamaguti"で"山口"等，打ち間違いを許して補完を試みる
+                candidates = self.search_fuzzy(base, key)
+        if(len(candidates) == 0):
+            return False
+        self.buffer_a = self.buffer_a + space
+        self.candidates = candidates
+        self.number = len(candidates)
+        if(self.widget == '-l'):
+            self.action = 'list'
+        elif((len(candidates) == 1) and (not self.is_truncated)):
+            # 補完候補が単数の場合
+            self.action = 'set'
+            self.buffer_l = self.buffer_a + candidates[0]
+            if(not re.match('^.*/$', candidates[0])):
+                # ディレクトリでない場合
+                self.buffer_l = self.buffer_l + ' '
+            self.buffer_r = self.buffer_c
+        else:
+            # 補完候補が複数の場合
+            common_part = get_common_part(candidates)
+            if(common_part == ''):
+                common_part = '---'  # 補完候補の共通部分が空の場合
+            if(self.is_partial or self.is_truncated):
+                self.action = 'part'
+            else:
+                self.action = 'set'
+            self.buffer_l = self.buffer_a + common_part
+            self.buffer_r = self.buffer_c
+        return True
+
+    ########################################
+    # CANDIDATES
+    ########################################
+
+    # 展開（"ls -d -- $word"に相当）
+    def expand(self, word):
+        names = sorted(glob.glob(to_glob(unquote(word))))
+        return check_candidates(names, self.mode, self.regexp,
+                                self.permission)
+
+    # 候補を作成（"ls -d -- $b* | grep -E ^$g($r)"に相当）
+    def get_candidates(self, base, key):
+        return list(self.iterate_candidates(base, key))
+
+    # 候補を作成（補完では，共通部分が決まり，一定の数に達すれば止める）
+    def collect_candidates(self, base, key):
+        tokens = unquote(re.sub('/+', '/', base))
+        if((self.limit <= 0) or (self.widget == '-l') or
+           any((not q) and (c in '*?') for c, q in tokens)):
+            return self.get_candidates(base, key)
+        # ワイルドカードがなければ，ファイル名の候補は全てこれで始まる
+        floor = escape(''.join(c for c, _ in tokens))
+        candidates = []
+        common_part = None
+        iterator = self.iterate_candidates(base, key)
+        for c in iterator:
+            candidates.append(c)
+            if(common_part is None):
+                common_part = c
+            else:
+                common_part = get_common_part([common_part, c])
+            if((len(candidates) >= self.limit) and
+               floor.startswith(common_part)):
+                # 残りの候補で，共通部分は変わらない
+                c = next(iterator, None)
+                if(c is not None):
+                    candidates.append(c)
+                    self.is_partial = True
+                break
+        return candidates
+
+    def iterate_candidates(self, base, key):
+        base = re.sub('/+', '/', base)
+        tokens = unquote(base)
+        g = to_regexp(tokens)
+        if(self.plus != ''):
+            for p in self.plus.split('\\n'):
+                if(re.match('^' + g + re.escape(key), p)):
+                    yield p
+        if(self.mode == 'Plus'):
+            return
+        pattern = to_glob(tokens) + '*'
+        directory = self.get_directory(base, pattern)
+        literal = None
+        if(not any((not q) and (c in '*?') for c, q in tokens)):
+            literal = ''.join(c for c, _ in tokens)
+        if(self.use_index and (directory is not None) and
+           (self.migemo_dictionary != '')):
+            # 読みの索引で探す
+            names = [literal + n for n in
+                     sazae_migemo.lookup_index(self.migemo_dictionary,
+                                               directory, key)]
+            yield from check_candidates(names, self.mode, self.regexp,
+                                        self.permission)
+            return
+        r = re.escape(key)
+        if(self.use_kana and (directory is not None) and
+           (not sazae_migemo.needs_kanji(directory))):
+            # 漢字を含むファイル名がなければ，辞書を使わない
+            migemo = sazae_romaji.get_kana_regexp(key)
+        else:
+            d = directory if(self.use_vocabulary) else None
+            if((key, d) not in self.migemo_regexps):
+                self.migemo_regexps[(key, d)] = get_migemo_regexp(
+                    key, self.migemo_command, self.migemo_dictionary, d)
+            migemo = self.migemo_regexps[(key, d)]
+        if(migemo != ''):
+            r = r + '|' + migemo
+        try:
+            matcher = re.compile('^' + g + '(' + r + ')')
+        except re.error:
+            r = re.escape(key)
+            matcher = re.compile('^' + g + '(' + r + ')')
+        if((literal is None) and (tokens[-1] == ('*', False)) and
+           not any((not q) and (c in '*?') for c, q in tokens[0:-1])):
+            # "*yama"等（語を含むファイル名）
+            prefilter = AhoCorasickFilter(''.join(c for c, _ in tokens[0:-1]),
+                                          True, '(' + r + ')',
+                                          self.aho_corasick_threshold)
+        else:
+            prefilter = Prefilter(literal, '(' + r + ')')
+        if(literal is None):
+            if(self.is_remote_word(base)):
+                # globとstatは，別のスレッドで期限まで
+                names = sazae_migemo.get_names(
+                    self.migemo_command, key, self.migemo_dictionary,
+                    pattern, matcher, prefilter,
+                    lambda p: self.run_within(lambda: sorted(glob.glob(p))),
+                    False)
+                yield from self.run_within(check_candidates, names,
+                                           self.mode, self.regexp,
+                                           self.permission)
+                return
+            names = sazae_migemo.get_names(self.migemo_command, key,
+                                           self.migemo_dictionary,
+                                           pattern, matcher, prefilter)
+            yield from check_candidates(names, self.mode, self.regexp,
+                                        self.permission)
+            return
+        # ワイルドカードがなければ，os.scandirで1回だけ走査する
+        enumerator = Enumerator(literal, self.deadline)
+        # ネットワークのファイルシステムでは，前回の候補を絞り込まない
+        # （前回の候補が期限で途中までかもしれず，statで止まるかもしれない）
+        narrow = ((self.deadline is None) or
+                  (not is_remote(enumerator.directory, self.deadline)))
+        names = sazae_migemo.get_names(self.migemo_command, key,
+                                       self.migemo_dictionary,
+                                       pattern, matcher, prefilter,
+                                       enumerator.list, narrow)
+        if(enumerator.is_truncated):
+            self.is_truncated = True
+        yield from enumerator.iterate(names, self.mode, self.regexp,
+                                      self.permission)
+        if(enumerator.is_truncated):
+            self.is_truncated = True
+
+    # 省略したパスの候補（"/u/s/e"で"/usr/share/emacs"等）
+    def search_abbreviation(self, base, key):
+        tokens = unquote(re.sub('/+', '/', base))
+        if(any((not q) and (c in '*?') for c, q in tokens)):
+            # ワイルドカードがあれば，従来どおりglobで展開する
+            return self.get_candidates(
+                re.sub('([^/])/', '\\1*/', base), key)
+        path = ''.join(c for c, _ in tokens)
+        i = path.rfind('/') + 1
+        directories = expand_directories(path[0:i])
+        if(directories == [path[0:i]]):
+            # 省略した部分がない
+            return []
+        candidates = []
+        for d in directories:
+            # 展開したディレクトリは，引用して渡す
+            candidates.extend(self.get_candidates(
+                ''.join('\\' + c for c in d + path[i:]), key))
+        return candidates
+
+    # パスの全ての部分にmigemoを適用した候補（ワイルドカードがあれば，なし）
+    def search_path(self, base, key):
+        if(self.mode == 'Plus'):
+            return []
+        tokens = unquote(re.sub('/+', '/', base))
+        if(any((not q) and (c in '*?') for c, q in tokens)):
+            return []
+        path = ''.join(c for c, _ in tokens) + key
+        if(not re.search('[a-zA-Z0-9]/', path)):
+            return []
+        search = PathSearch(self.migemo_command, self.migemo_dictionary)
+        return check_candidates(search.search(path), self.mode, self.regexp,
+                                self.permission)
+
+    # 読みのローマ字が打ち間違いの範囲で一致する候補（距離の小さい順）
+    def search_fuzzy(self, base, key):
+        if((self.mode == 'Plus') or (key == '')):
+            return []
+        base = re.sub('/+', '/', base)
+        tokens = unquote(base)
+        if(any((not q) and (c in '*?') for c, q in tokens)):
+            return []
+        directory = self.get_directory(base, to_glob(tokens) + '*')
+        if(directory is None):
+            return []
+        literal = ''.join(c for c, _ in tokens)
+        names = [literal + n for n in
+                 sazae_migemo.lookup_fuzzy(self.migemo_dictionary, directory,
+                                           key, self.fuzzy_distance)]
+        return check_candidates(names, self.mode, self.regexp,
+                                self.permission)
+
+    # 期限まで別のスレッドで実行した結果（終わらなければ空）
+    def run_within(self, function, *args):
+        if(is_busy()):
+            # 止まったままのスレッドが多過ぎる
+            self.is_truncated = True
+            return []
+        task = Task(function, *args)
+        if(not task.wait(self.deadline)):
+            self.is_truncated = True
+            return []
+        if(task.error is not None):
+            return []
+        return task.result
+
+    # 語のディレクトリがネットワークのファイルシステムか（期限がなければ偽）
+    def is_remote_word(self, word):
+        if(self.deadline is None):
+            return False
+        path = ''
+        for c, q in unquote(re.sub('/+', '/', word)):
+            if((not q) and (c in '*?')):
+                break  # ワイルドカードより前のディレクトリ
+            path = path + c
+        directory = os.path.dirname(path)
+        return is_remote(directory if(directory != '') else '.', self.deadline)
+
+    # ローマ字がファイル名の先頭にある場合のディレクトリ
+    def get_directory(self, base, pattern):
+        if((base != '') and (not base.endswith('/'))):
+            return None
+        directory = os.path.dirname(pattern)
+        if(glob.has_magic(directory)):
+            return None
+        if(directory == ''):
+            return '.'
+        return directory
+
+    ########################################
+    # OUTPUT
+    ########################################
+
+    def output(self):
+        print(self.action)
+        print(self.number)
+        print(encode_buffer(self.buffer_a))
+        print(encode_buffer(self.buffer_c))
+        print(encode_buffer(self.buffer_l))
+        print(encode_buffer(self.buffer_r))
+        for c in self.candidates:
+            print(c)
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] +
+                  ' [option] [-l|-c|-r] [left part] [right part]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -d <path>             specify the current directory')
+            print('  -m <command>          specify the migemo command')
+            print('  -D <dictionary>       use migemo-dict instead of the command')
+            print('  -V                    use the vocabulary of the directory')
+            print('  -I                    use the reading index of the directory')
+            print('  -K                    use kana only if no name has kanji')
+            print('  -F <distance>         allow typos within the edit distance')
+            print('  -n <number>           stop at this many candidates once' +
+                  ' their common part is settled')
+            print('  -t <seconds>          time budget on network filesystems')
+            print('  -A <number>           use Aho-Corasick from this many names')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    migemo_command = ''
+    migemo_dictionary = ''
+    use_vocabulary = False
+    use_index = False
+    use_kana = False
+    fuzzy_distance = 0
+    limit = 0
+    timeout = 0
+    aho_corasick_threshold = MIN_NAMES
+    args = sys.argv[1:]
+    while(len(args) > 3):
+        a = args.pop(0)
+        if(a == '-d'):
+            os.chdir(args.pop(0))
+        elif(a == '-m'):
+            migemo_command = args.pop(0)
+        elif(a == '-D'):
+            migemo_dictionary = args.pop(0)
+        elif(a == '-V'):
+            use_vocabulary = True
+        elif(a == '-I'):
+            use_index = True
+        elif(a == '-K'):
+            use_kana = True
+        elif(a == '-F'):
+            fuzzy_distance = int(args.pop(0))
+        elif(a == '-n'):
+            limit = int(args.pop(0))
+        elif(a == '-t'):
+            timeout = float(args.pop(0))
+        elif(a == '-A'):
+            aho_corasick_threshold = int(args.pop(0))
+    if(len(args) != 3):
+        sys.exit(2)
+    completion = Completion(args[1], args[2], args[0], migemo_command,
+                            migemo_dictionary, use_vocabulary, use_index,
+                            use_kana, fuzzy_distance, limit, timeout,
+                            aho_corasick_threshold)
+    completion.complete()
+    completion.output()
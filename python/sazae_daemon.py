@@ -0,0 +1,420 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_daemon.py
+# Version:      v05
+# Time-stamp:   <2026.10.19-03:08:45-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# pythonのスクリプトを常駐させ，UNIXドメインソケットで依頼を受け付けます。
+#
+# 補完のたびにpythonを起動する負担（起動，import，正規表現のコンパイル）を
+# なくすため，各スクリプトをコンパイル済みの状態で保持し，
+# 依頼に応じて同じプロセスの中で実行します。
+# 一定時間（既定は600秒）依頼がなければ終了します。
+# migemoのコマンドも対話モードで常駐させます（sazae_migemo.py）。
+# Aho-Corasickのオートマトン（sazae_aho_corasick.py）も保持します。
+# ディレクトリの一覧（sazae_directory_cache.py）は，inotifyで監視します。
+#
+# ソケットのディレクトリは，自分のもので，他人が使えない（0700）ことを
+# 確かめます（"/tmp/sazae-$UID"を他人が先に作った場合は，起動しません）。
+# 依頼は1つずつ処理するので，依頼の受信と応答の送信には時間の制限
+# （CONNECTION_TIMEOUT）を設け，止まった接続は切ります。
+#
+# 依頼と応答は，NUL文字で終端された欄の並びです。
+#   依頼：欄の数，カレントディレクトリ，スクリプト名，標準入力，引数…
+#   応答：終了ステータス，標準出力
+#
+# 例：> ./sazae_daemon.py -s /run/user/1000/sazae/sazae.sock --start
+#     > printf '%s\0' 4 /tmp extract_common_part 'abcdef\nabcghi' '' \
+#         | nc -U -q 1 /run/user/1000/sazae/sazae.sock | tr '\0' '\n'
+#     0
+#     abc
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import io
+import re
+import stat
+import errno
+import fcntl
+import select
+import signal
+import socket
+import traceback
+
+import sazae_migemo
+import sazae_aho_corasick
+import sazae_directory_cache
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v05'
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+IDLE_TIMEOUT = 600
+CONNECTION_TIMEOUT = 2.0   # 依頼の受信と応答の送信を待つ秒数
+RECEIVE_SIZE = 65536
+NAME_PATTERN = '^[_a-z0-9]+$'
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# ソケットの場所
+def get_socket_path():
+    runtime = os.environ.get('XDG_RUNTIME_DIR', '')
+    if((runtime != '') and os.path.isdir(runtime)):
+        directory = os.path.join(runtime, 'sazae')
+    else:
+        directory = os.path.join('/tmp', 'sazae-' + str(os.getuid()))
+    return os.path.join(directory, 'sazae.sock')
+
+
+# ソケットのディレクトリを作り，自分のもので，他人が使えないことを確かめる
+#   そうでなければ（他人が先に作った場合等），PermissionError
+def prepare_directory(directory):
+    parent = os.path.dirname(directory)
+    if((parent != '') and (not os.path.isdir(parent))):
+        os.makedirs(parent)
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(directory)
+    if((not stat.S_ISDIR(st.st_mode)) or (st.st_uid != os.getuid()) or
+       (st.st_mode & 0o077)):
+        raise PermissionError(errno.EACCES, 'unsafe socket directory',
+                              directory)
+
+
+# 欄をNUL文字で終端して連結
+def encode_fields(fields):
+    return b''.join(f.encode('utf-8', 'surrogateescape') + b'\0'
+                    for f in fields)
+
+
+# 依頼を受信（最初の欄は，残りの欄の数）
+def receive_fields(conn):
+    data = b''
+    number = -1
+    while(True):
+        if(number < 0 and b'\0' in data):
+            number = int(data[:data.index(b'\0')])
+        if(number >= 0 and data.count(b'\0') >= number + 1):
+            break
+        chunk = conn.recv(RECEIVE_SIZE)
+        if(not chunk):
+            raise EOFError('incomplete request')
+        data = data + chunk
+    fields = data.split(b'\0')[1:number + 1]
+    return [f.decode('utf-8', 'surrogateescape') for f in fields]
+
+
+# デーモンに依頼（テストやpythonからの利用のため）
+def call(path, cwd, name, stdin, args, timeout=CONNECTION_TIMEOUT):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    try:
+        conn.connect(path)
+        fields = [cwd, name, stdin] + list(args)
+        conn.sendall(encode_fields([str(len(fields))] + fields))
+        data = b''
+        while(data.count(b'\0') < 2):
+            chunk = conn.recv(RECEIVE_SIZE)
+            if(not chunk):
+                raise EOFError('incomplete response')
+            data = data + chunk
+    finally:
+        conn.close()
+    fields = data.split(b'\0')
+    return (int(fields[0]),
+            fields[1].decode('utf-8', 'surrogateescape'))
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Script:
+    """A class holding a compiled script"""
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = None
+        self.code = None
+
+    # スクリプトが更新されていれば，コンパイルし直す
+    def load(self):
+        mtime = os.stat(self.path).st_mtime
+        if(self.code is None or mtime != self.mtime):
+            with open(self.path, 'rb') as f:
+                source = f.read()
+            self.code = compile(source, self.path, 'exec')
+            self.mtime = mtime
+        return self.code
+
+    # 標準入力，標準出力，引数を差し替えて実行
+    def run(self, args, stdin):
+        code = self.load()
+        saved = (sys.argv, sys.stdin, sys.stdout)
+        output = io.StringIO()
+        sys.argv = [self.path] + list(args)
+        sys.stdin = io.StringIO(stdin)
+        sys.stdout = output
+        status = 0
+        try:
+            exec(code, {'__name__': '__main__',
+                        '__file__': self.path,
+                        '__builtins__': __builtins__})
+        except SystemExit as e:
+            if(e.code is None):
+                status = 0
+            elif(isinstance(e.code, int)):
+                status = e.code
+            else:
+                status = 1
+        except Exception:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.argv, sys.stdin, sys.stdout = saved
+            # sazae_line_up.pyがSIGPIPEを既定に戻すため
+            signal.signal(signal.SIGPIPE, signal.SIG_IGN)
+        return status, output.getvalue()
+
+
+class Server:
+    """A class serving the scripts over a unix domain socket"""
+
+    def __init__(self, path, timeout=IDLE_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self.scripts = {}
+        self.handlers = {'stop': self._stop,
+                         'ping': self._ping,
+                         'migemo': self._migemo,
+                         'aho_corasick': self._aho_corasick}
+        self.is_stopping = False
+        self.sock = None
+
+    ########################################
+    # LISTEN
+    ########################################
+
+    def listen(self):
+        prepare_directory(os.path.dirname(self.path))
+        if(os.path.exists(self.path)):
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.path)
+        self.sock.listen(16)
+
+    def serve(self):
+        try:
+            while(not self.is_stopping):
+                readable, _, _ = select.select([self.sock], [], [],
+                                               self.timeout)
+                if(not readable):
+                    break  # 一定時間依頼がないので終了
+                conn, _ = self.sock.accept()
+                # 止まったクライアントで，他のシェルを待たせない
+                conn.settimeout(CONNECTION_TIMEOUT)
+                try:
+                    self.handle(conn)
+                except (OSError, EOFError):
+                    pass  # 時間切れや，待ちきれずに切られた接続
+                except Exception:
+                    traceback.print_exc()
+                finally:
+                    conn.close()
+        finally:
+            self.close()
+
+    def close(self):
+        if(self.sock is not None):
+            self.sock.close()
+            self.sock = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    ########################################
+    # HANDLE
+    ########################################
+
+    def handle(self, conn):
+        fields = receive_fields(conn)
+        cwd, name, stdin, args = fields[0], fields[1], fields[2], fields[3:]
+        try:
+            os.chdir(cwd)
+        except OSError:
+            os.chdir('/')
+        if(name in self.handlers):
+            status, output = self.handlers[name](args, stdin)
+        else:
+            status, output = self._run_script(name, args, stdin)
+        conn.sendall(encode_fields([str(status), output]))
+
+    def _run_script(self, name, args, stdin):
+        if(not re.match(NAME_PATTERN, name)):
+            return 2, ''
+        if(name not in self.scripts):
+            path = os.path.join(SCRIPT_DIRECTORY, 'sazae_' + name + '.py')
+            if(not os.path.isfile(path)):
+                return 2, ''
+            self.scripts[name] = Script(path)
+        return self.scripts[name].run(args, stdin)
+
+    def _stop(self, args, stdin):
+        self.is_stopping = True
+        return 0, ''
+
+    def _ping(self, args, stdin):
+        return 0, VERSION
+
+    # 常駐させたmigemoに問い合わせる
+    def _migemo(self, args, stdin):
+        return sazae_migemo.main(list(args))
+
+    # 保持したオートマトンで絞り込む
+    def _aho_corasick(self, args, stdin):
+        return sazae_aho_corasick.main(list(args), stdin)
+
+
+############################################################
+# DAEMON
+############################################################
+
+
+# 既に起動しているか
+def is_running(path):
+    try:
+        status, _ = call(path, '/', 'ping', '', [])
+    except (OSError, EOFError, ValueError):
+        return False
+    return status == 0
+
+
+# 二重にforkして端末から切り離す
+def daemonize():
+    if(os.fork() > 0):
+        os._exit(0)
+    os.setsid()
+    if(os.fork() > 0):
+        os._exit(0)
+    os.chdir('/')
+    null = os.open(os.devnull, os.O_RDWR)
+    for fd in [0, 1, 2]:
+        os.dup2(null, fd)
+    os.close(null)
+
+
+def start(path, timeout, foreground):
+    try:
+        prepare_directory(os.path.dirname(path))
+    except OSError as e:
+        sys.stderr.write(sys.argv[0] + ': ' + str(e) + '\n')
+        return 1
+    if(is_running(path)):
+        return 0
+    if(not foreground):
+        daemonize()
+    # 複数のシェルから同時に起動された場合に備えて排他制御
+    lock = open(path + '.lock', 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except IOError as e:
+        if(e.errno in [errno.EAGAIN, errno.EACCES]):
+            return 0
+        raise
+    if(is_running(path)):
+        return 0
+    signal.signal(signal.SIGPIPE, signal.SIG_IGN)
+    sazae_migemo.set_persistent(True)
+    sazae_directory_cache.set_persistent(True)
+    server = Server(path, timeout)
+    server.listen()
+    server.serve()
+    lock.close()
+    return 0
+
+
+def stop(path):
+    try:
+        call(path, '/', 'stop', '', [])
+    except (OSError, EOFError, ValueError):
+        return 1
+    return 0
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -s <path>             specify the socket')
+            print('  -t <seconds>          specify the idle timeout')
+            print('  --start               start the daemon')
+            print('  --stop                stop the daemon')
+            print('  --foreground          do not detach from the terminal')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    socket_path = get_socket_path()
+    idle_timeout = IDLE_TIMEOUT
+    action = 'start'
+    is_foreground = False
+    args = sys.argv[1:]
+    while(args):
+        a = args.pop(0)
+        if(a == '-s' and args):
+            socket_path = args.pop(0)
+        elif(a == '-t' and args):
+            idle_timeout = int(args.pop(0))
+        elif(a == '--start'):
+            action = 'start'
+        elif(a == '--stop'):
+            action = 'stop'
+        elif(a == '--foreground'):
+            is_foreground = True
+    if(action == 'stop'):
+        sys.exit(stop(socket_path))
+    sys.exit(start(socket_path, idle_timeout, is_foreground))
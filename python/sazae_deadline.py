@@ -0,0 +1,296 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_deadline.py
+# Version:      v04
+# Time-stamp:   <2026.10.19-03:41:52-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ネットワークのファイルシステム（NFS，SMB，sshfs等）で，補完が
+# プロンプトを止めないように，ファイルの操作を期限付きで行います。
+#
+# Taskは，関数を別のスレッドで実行し，期限まで待ちます。期限を過ぎても，
+# スレッドは止めずに（止められない），終わった結果を後で使えるようにします。
+# 止まったままのスレッドが増え過ぎないよう，同時に動くTaskの数は，全体で
+# 一定（MAX_TASKS）までです（is_busy）。
+#
+# ファイルシステムの種類は，Linuxでは，statfsのf_type（ctypesで呼び出す）で
+# 調べます（struct statfsの先頭がf_typeなのはLinuxだけです）。
+# それ以外（macOS，BSD等）では，mountコマンドの出力から，最も長く一致する
+# マウントポイントの種類の名前（REMOTE_NAMES）で調べます。
+# ネットワークのファイルシステムかは，ディレクトリごとに一定時間
+# （EXPIRE_SECONDS）保持します（後からマウントしたものも分かるように）。
+# statfs自体が期限までに終わらなければ，ネットワークのファイルシステムと
+# みなします。ただし，期限が迫っていても（前の処理で使い切っていても）
+# 少し（MIN_CHECK_SECONDS）は待ち，終わらなかった結果は保持せず，
+# 次の問合せで，終わっていればその結果を使います。
+# ディレクトリがなければ（補完の途中の"/mnt/nfs/u/s/"等），親の
+# ディレクトリで調べます。
+#
+# 例：> ./sazae_deadline.py /mnt/nfs /tmp
+#     /mnt/nfs nfs
+#     /tmp local
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import time
+import re
+import threading
+import subprocess
+import ctypes
+import ctypes.util
+from collections import OrderedDict
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v04'
+TIMEOUT = 0.5            # 既定の期限（秒）
+MAX_DIRECTORIES = 1024   # ファイルシステムの種類を保持するディレクトリの数
+EXPIRE_SECONDS = 60      # ファイルシステムの種類を保持する時間（秒）
+MAX_TASKS = 8            # 同時に動くTask（スレッド）の数
+MIN_CHECK_SECONDS = 0.2  # 期限を過ぎていても，statfsを待つ秒数
+STATFS_SIZE = 512        # struct statfsより大きければよい
+
+# statfsのf_type -> 名前（ネットワークのファイルシステム）
+REMOTE_TYPES = {0x00006969: 'nfs',
+                0x0000517b: 'smb',
+                0xff534d42: 'cifs',
+                0xfe534d42: 'smb2',
+                0x65735546: 'fuse',    # sshfs等（fuseは全て）
+                0x73757245: 'coda',
+                0x5346414f: 'afs',
+                0x6b414653: 'afs',
+                0x00c36400: 'ceph',
+                0x01021997: 'v9fs',
+                0x0000564c: 'ncp',
+                0x47504653: 'gpfs',
+                0x013111a8: 'ibrix',
+                0x0bd00bd0: 'lustre'}
+
+# mountコマンドの種類の名前（ネットワークのファイルシステム）
+#   "fuse"を含む名前（osxfuse，macfuse，fusefs.sshfs等）も
+REMOTE_NAMES = {'nfs', 'nfs4', 'smbfs', 'cifs', 'afpfs', 'webdav', 'ftp',
+                'sshfs', 'afs', 'ceph'}
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 期限（time.monotonicの時刻）までの秒数
+def get_remaining(deadline):
+    return max(0.0, deadline - time.monotonic())
+
+
+# 動いているTaskが上限に達したか
+def is_busy():
+    return running_tasks >= MAX_TASKS
+
+
+# statfsのf_type（Linux以外や，statfsがなければOSError）
+def get_filesystem_type(path):
+    if((statfs is None) or (not sys.platform.startswith('linux'))):
+        raise OSError('statfs is not available')
+    buf = ctypes.create_string_buffer(STATFS_SIZE)
+    if(statfs(os.fsencode(path), buf) != 0):
+        e = ctypes.get_errno()
+        raise OSError(e, os.strerror(e), path)
+    return ctypes.c_long.from_buffer(buf).value & 0xffffffff
+
+
+# マウントポイント -> 種類の名前（mountコマンドの出力）
+#   "//u@host/share on /Volumes/share (smbfs, nodev, ...)"
+#   "/dev/ada0p2 on / (ufs, local, journaled soft-updates)"
+#   "host:/export on /mnt/nfs type nfs4 (rw,relatime)"（Linuxの形式）
+def get_mount_table():
+    output = subprocess.run(['mount'], stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL,
+                            universal_newlines=True).stdout
+    return parse_mount_table(output)
+
+
+def parse_mount_table(output):
+    table = {}
+    for line in output.splitlines():
+        m = re.match(r'^.* on (/.*?)(?: type (\S+))? \(([^,)]+)', line)
+        if(m):
+            table[m.group(1)] = (m.group(2) or m.group(3)).strip()
+    return table
+
+
+# パスのマウントポイントの種類の名前（最も長く一致するもの）
+def get_mount_type(path):
+    table = get_mount_table()
+    while(path not in table):
+        parent = os.path.dirname(path)
+        if(parent == path):
+            return ''
+        path = parent
+    return table[path]
+
+
+# ファイルシステムの名前（ネットワークのものでなければ'local'）
+def get_filesystem_name(path):
+    if(sys.platform.startswith('linux')):
+        return REMOTE_TYPES.get(get_filesystem_type(path), 'local')
+    name = get_mount_type(path)
+    if((name in REMOTE_NAMES) or ('fuse' in name)):
+        return name
+    return 'local'
+
+
+# 保持した，ディレクトリか親のディレクトリがネットワークのものか（なければNone）
+def get_remembered(path):
+    while(True):
+        if(path in remote_directories):
+            return remote_directories[path][0]
+        parent = os.path.dirname(path)
+        if(parent == path):
+            return None
+        path = parent
+
+
+# ネットワークのファイルシステムか（期限までにstatfsが終わらなくても）
+def is_remote(directory, deadline):
+    path = os.path.abspath(directory)
+    if(path in remote_directories):
+        remote, checked = remote_directories[path]
+        if(time.monotonic() - checked < EXPIRE_SECONDS):
+            remote_directories.move_to_end(path)
+            return remote
+        del remote_directories[path]
+    task = checking_directories.get(path)
+    if(task is None):
+        if(is_busy()):
+            # スレッドが足りなければ，調べずに，保持した親のディレクトリで
+            # （分からなければ，止まらないように，ネットワークのものとみなす）
+            remote = get_remembered(path)
+            return True if(remote is None) else remote
+        task = Task(get_filesystem_name, path)
+        checking_directories[path] = task
+        deadline = max(deadline, time.monotonic() + MIN_CHECK_SECONDS)
+    if(not task.wait(deadline)):
+        # 終わっていないので保持しない（止まっていないかもしれない）
+        return True
+    del checking_directories[path]
+    if(task.error is not None):
+        # ないディレクトリは，親のディレクトリのファイルシステム
+        parent = os.path.dirname(path)
+        remote = (parent != path) and is_remote(parent, deadline)
+    else:
+        remote = (task.result != 'local')
+    remote_directories[path] = (remote, time.monotonic())
+    while(len(remote_directories) > MAX_DIRECTORIES):
+        remote_directories.popitem(last=False)
+    return remote
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Task:
+    """A class running a function on a worker thread"""
+
+    def __init__(self, function, *args):
+        global running_tasks
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        with lock:
+            running_tasks += 1
+        thread = threading.Thread(target=self._run, args=(function, args))
+        # 止まったままのスレッドがあっても，終了できるように
+        thread.daemon = True
+        thread.start()
+
+    def _run(self, function, args):
+        global running_tasks
+        try:
+            self.result = function(*args)
+        except Exception as e:
+            self.error = e
+        finally:
+            with lock:
+                running_tasks -= 1
+            self.done.set()
+
+    # 期限（time.monotonicの時刻）まで待ち，終わったかを返す
+    def wait(self, deadline):
+        return self.done.wait(get_remaining(deadline))
+
+    def is_done(self):
+        return self.done.is_set()
+
+
+# statfs（libcになければNone）
+try:
+    statfs = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).statfs
+    statfs.argtypes = [ctypes.c_char_p, ctypes.c_void_p]
+except (OSError, AttributeError):
+    statfs = None
+
+# ディレクトリ -> (ネットワークのファイルシステムか, 調べた時刻)
+remote_directories = OrderedDict()
+
+# ディレクトリ -> ファイルシステムの種類を調べているTask（期限までに
+# 終わらなかったもの）
+checking_directories = {}
+
+# 動いているTaskの数
+running_tasks = 0
+lock = threading.Lock()
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [directory...]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    for d in sys.argv[1:]:
+        task = Task(get_filesystem_name, d)
+        if(not task.wait(time.monotonic() + TIMEOUT)):
+            print(d + ' timeout')
+        elif(task.error is not None):
+            sys.stderr.write(sys.argv[0] + ': ' + str(task.error) + '\n')
+        else:
+            print(d + ' ' + task.result)
@@ -0,0 +1,418 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_directory_cache.py
+# Version:      v05
+# Time-stamp:   <2026.10.19-01:36:52-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ディレクトリの一覧（名前と，os.scandirの項目）を保持し，ディレクトリが
+# 変わるまで，読み直さずに使います。
+#
+# 一覧は，ディレクトリの(デバイス, iノード, 更新時刻(ns))で識別し，
+# 使うたびに1回だけstatして確かめます。項目（DirEntry）は，ファイルの種類を
+# 走査の結果から返し，statの結果は最初に必要になった時に保持します。
+# 更新時刻の直後に読んだ一覧は，同じ時刻の間に変わったかもしれないので，
+# 次に使う時に読み直します。
+# 名前は整列して保持するので，ある文字列で始まる名前は，二分探索した範囲に
+# なります（Snapshot.range）。
+#
+# 一覧の項目の数の合計が一定（MAX_ENTRIES）を超えれば，最も長く使って
+# いない一覧から捨てます。
+# デーモンの中では，同じディレクトリで何度補完しても，ディレクトリが
+# 変わらなければ，1回しか読みません。
+#
+# デーモンの中では（set_persistent），Linuxのinotify（sazae_inotify.py）で
+# 一覧のディレクトリを監視し，作成，削除，名前の変更の事象で，読み直さずに
+# 一覧を直します。監視しているディレクトリは，使うたびにはstatせず，
+# 一定時間（CHECK_NS）ごとに，同じディレクトリか（デバイス, iノード）だけを
+# 確かめます。監視の数が上限に達した後のディレクトリや，inotifyのない
+# 環境では，従来どおり，更新時刻で確かめます。
+#
+# ネットワークのファイルシステム（sazae_deadline.py）の一覧は，期限を付けて
+# 使います（get_within）。一覧は別のスレッドで読み，期限までに読めなければ，
+# 前の一覧か，読んだところまでの一覧を返します。読み終わった一覧は，
+# 次に使う時に保持します。保持した一覧は，一定時間（REMOTE_CHECK_NS）の間は
+# statせずに使います。
+#
+# 例：> ./sazae_directory_cache.py 都道府県 都道府県
+#     47 entries (listed)
+#     47 entries (cached)
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import stat
+import time
+import errno
+import bisect
+from collections import OrderedDict
+
+import sazae_inotify
+from sazae_deadline import Task, is_remote, is_busy
+from sazae_prefilter import get_successor
+from sazae_inotify import (IN_ATTRIB, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE,
+                           IN_DELETE, IN_DELETE_SELF, IN_MOVE_SELF,
+                           IN_Q_OVERFLOW, IN_IGNORED)
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v05'
+MAX_ENTRIES = 200000    # 保持する項目の数の合計
+RACY_NS = 2000000000    # 更新時刻からこの時間（ns）以内に読んだ一覧は読み直す
+CHECK_NS = 5000000000   # 監視している一覧を，この時間（ns）ごとに確かめる
+REMOTE_CHECK_NS = 10000000000   # ネットワークの一覧を，この時間（ns）は使う
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Entry:
+    """A class standing in for os.DirEntry of a name added by an event"""
+
+    def __init__(self, directory, name):
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self._stat = None
+        self._lstat = None
+
+    def stat(self, follow_symlinks=True):
+        if(not follow_symlinks):
+            if(self._lstat is None):
+                self._lstat = os.lstat(self.path)
+            return self._lstat
+        if(self._stat is None):
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def is_dir(self, follow_symlinks=True):
+        try:
+            return stat.S_ISDIR(self.stat(follow_symlinks).st_mode)
+        except OSError:
+            return False
+
+    def is_symlink(self):
+        try:
+            return stat.S_ISLNK(self.stat(False).st_mode)
+        except OSError:
+            return False
+
+
+class Snapshot:
+    """A class holding the entries of a directory at one moment"""
+
+    # wdは，inotifyの監視の番号（監視していなければNone）
+    # entriesを渡せば，読みかけの項目を，他のスレッドから見られる
+    def __init__(self, path, key, wd=None, entries=None):
+        self.path = path
+        self.key = key
+        self.wd = wd
+        self.entries = {} if(entries is None) else entries
+        with os.scandir(path) as it:
+            for e in it:
+                self.entries[e.name] = e
+        self.names = sorted(self.entries)
+        self.checked = time.time_ns()
+        # 更新時刻と同じ時刻の間に読んだかもしれない
+        #   （監視していれば，読む前からの事象で直すので，読み直さない）
+        self.is_racy = ((wd is None) and (self.checked - key[2] < RACY_NS))
+
+    # prefixで始まる名前の範囲[i, j)（namesは整列済み）
+    def range(self, prefix, lo=0, hi=None):
+        if(hi is None):
+            hi = len(self.names)
+        i = bisect.bisect_left(self.names, prefix, lo, hi)
+        successor = get_successor(prefix)
+        if(successor is None):
+            return i, hi
+        return i, bisect.bisect_left(self.names, successor, i, hi)
+
+    # 名前を加え，増えた項目の数を返す
+    def add(self, name):
+        is_new = (name not in self.entries)
+        self.entries[name] = Entry(self.path, name)
+        if(is_new):
+            bisect.insort(self.names, name)
+        return 1 if(is_new) else 0
+
+    # 名前を除き，増えた項目の数（-1か0）を返す
+    def discard(self, name):
+        if(self.entries.pop(name, None) is None):
+            return 0
+        del self.names[bisect.bisect_left(self.names, name)]
+        return -1
+
+    # 属性が変わった項目を，statし直すようにする
+    def refresh(self, name):
+        if(name in self.entries):
+            self.entries[name] = Entry(self.path, name)
+
+
+class PartialSnapshot(Snapshot):
+    """A class holding the entries read so far by an unfinished scan"""
+
+    def __init__(self, path, entries):
+        self.path = path
+        self.key = None
+        self.wd = None
+        self.entries = dict(entries)
+        self.names = sorted(self.entries)
+        self.checked = time.time_ns()
+        self.is_racy = True
+
+
+class DirectoryCache:
+    """A class caching directory snapshots with LRU eviction by entries"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.snapshots = OrderedDict()
+        self.number_of_entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.inotify = None
+        # 監視の番号 -> 一覧のパス（同じディレクトリを別のパスで読んだ場合も）
+        self.watches = {}
+        # パス -> (ネットワークの一覧を読むTask, 読んだ項目)
+        self.tasks = {}
+
+    # inotifyで監視するか（inotifyのない環境では，何もしない）
+    def set_watching(self, flag):
+        if(flag and (self.inotify is None)):
+            try:
+                self.inotify = sazae_inotify.Inotify()
+            except OSError:
+                self.inotify = None
+        elif((not flag) and (self.inotify is not None)):
+            self.remove_watched()
+            self.inotify.close()
+            self.inotify = None
+
+    # ディレクトリの一覧（変わっていなければ，保持したもの）
+    def get(self, directory):
+        path = os.path.abspath(directory)
+        self.update()
+        snapshot = self.snapshots.get(path)
+        if((snapshot is not None) and (snapshot.wd is not None) and
+           (time.time_ns() - snapshot.checked < CHECK_NS)):
+            return self.hit(path, snapshot)
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        if(snapshot is not None):
+            if((snapshot.wd is not None) and (snapshot.key[0:2] == key[0:2])):
+                # 更新時刻の変化は，事象で直してある
+                snapshot.key = key
+                snapshot.checked = time.time_ns()
+                return self.hit(path, snapshot)
+            if((snapshot.key == key) and (not snapshot.is_racy)):
+                return self.hit(path, snapshot)
+        self.misses += 1
+        self.remove(path)
+        wd = self.watch(path)
+        try:
+            snapshot = Snapshot(path, key, wd)
+        except OSError:
+            self.unwatch(path, wd)
+            raise
+        return self.store(path, snapshot)
+
+    # 期限（time.monotonicの時刻）付きの一覧と，読み終わったか
+    #   ネットワークのファイルシステムでなければ，getと同じ
+    def get_within(self, directory, deadline):
+        path = os.path.abspath(directory)
+        if(not is_remote(path, deadline)):
+            return self.get(directory), True
+        self.adopt()
+        snapshot = self.snapshots.get(path)
+        if((snapshot is not None) and
+           (time.time_ns() - snapshot.checked < REMOTE_CHECK_NS)):
+            return self.hit(path, snapshot), True
+        if(path not in self.tasks):
+            if(is_busy()):
+                # 止まったスレッドが多過ぎる
+                return snapshot or PartialSnapshot(path, {}), False
+            entries = {}
+            self.tasks[path] = (Task(load_snapshot, path, entries), entries)
+        task, entries = self.tasks[path]
+        if(not task.wait(deadline)):
+            # 前の一覧か，読んだところまでの一覧
+            return snapshot or PartialSnapshot(path, entries), False
+        self.adopt()
+        if(task.error is not None):
+            raise task.error
+        self.misses += 1
+        return self.snapshots.get(path, task.result), True
+
+    # 読み終わったネットワークの一覧を保持する
+    def adopt(self):
+        for path, (task, _) in list(self.tasks.items()):
+            if(not task.is_done()):
+                continue
+            del self.tasks[path]
+            if(task.error is None):
+                self.store(path, task.result)
+            else:
+                self.remove(path)
+
+    def store(self, path, snapshot):
+        self.remove(path)
+        if(len(snapshot.names) <= self.max_entries):
+            self.snapshots[path] = snapshot
+            self.number_of_entries += len(snapshot.names)
+            self.evict()
+        elif(snapshot.wd is not None):
+            self.unwatch(path, snapshot.wd)
+        return snapshot
+
+    def hit(self, path, snapshot):
+        self.snapshots.move_to_end(path)
+        self.hits += 1
+        return snapshot
+
+    # 溜まった事象で，監視している一覧を直す
+    def update(self):
+        if(self.inotify is None):
+            return
+        for wd, mask, name in self.inotify.read_events():
+            if(mask & IN_Q_OVERFLOW):
+                # 事象を取りこぼしたので，監視している一覧を全て捨てる
+                self.remove_watched()
+                continue
+            for path in list(self.watches.get(wd, [])):
+                snapshot = self.snapshots[path]
+                if(mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED)):
+                    self.remove(path)
+                elif(mask & (IN_CREATE | IN_MOVED_TO)):
+                    self.number_of_entries += snapshot.add(name)
+                elif(mask & (IN_DELETE | IN_MOVED_FROM)):
+                    self.number_of_entries += snapshot.discard(name)
+                elif((mask & IN_ATTRIB) and (name != '')):
+                    snapshot.refresh(name)
+        self.evict()
+
+    # 監視を加える（上限に達していれば，None）
+    def watch(self, path):
+        if((self.inotify is None) or
+           (len(self.watches) >= self.inotify.budget)):
+            return None
+        try:
+            wd = self.inotify.add_watch(path)
+        except OSError as e:
+            if(e.errno == errno.ENOSPC):
+                # 利用者ごとの上限に達した
+                self.inotify.budget = len(self.watches)
+            return None
+        self.watches.setdefault(wd, set()).add(path)
+        return wd
+
+    # 監視を外す（同じディレクトリの別のパスがなければ）
+    def unwatch(self, path, wd):
+        paths = self.watches.get(wd)
+        if(paths is None):
+            return
+        paths.discard(path)
+        if(not paths):
+            del self.watches[wd]
+            self.inotify.rm_watch(wd)
+
+    def evict(self):
+        while(self.number_of_entries > self.max_entries):
+            self.remove(next(iter(self.snapshots)))
+
+    def remove(self, path):
+        snapshot = self.snapshots.pop(path, None)
+        if(snapshot is not None):
+            self.number_of_entries -= len(snapshot.names)
+            if(snapshot.wd is not None):
+                self.unwatch(path, snapshot.wd)
+
+    def remove_watched(self):
+        for path in [p for p, s in self.snapshots.items()
+                     if(s.wd is not None)]:
+            self.remove(path)
+
+    def clear(self):
+        for path in list(self.snapshots):
+            self.remove(path)
+
+
+# ネットワークの一覧を読む（別のスレッドで，読んだ項目をentriesに加えながら）
+def load_snapshot(path, entries):
+    st = os.stat(path)
+    snapshot = Snapshot(path, (st.st_dev, st.st_ino, st.st_mtime_ns), None,
+                        entries)
+    # シンボリックリンクの先の種類も，このスレッドで調べておく
+    for e in list(snapshot.entries.values()):
+        if(e.is_symlink()):
+            e.is_dir()
+    return snapshot
+
+
+# デーモンの中では，補完のたびに使い回す
+cache = DirectoryCache()
+
+
+def set_persistent(flag):
+    cache.set_watching(flag)
+
+
+# ディレクトリの名前（整列済み，読めなければ空）
+def list_directory(directory):
+    try:
+        return cache.get(directory).names
+    except OSError:
+        return []
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [directory...]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    for d in sys.argv[1:]:
+        misses = cache.misses
+        try:
+            snapshot = cache.get(d)
+        except OSError as e:
+            sys.stderr.write(sys.argv[0] + ': ' + str(e) + '\n')
+            continue
+        print(str(len(snapshot.names)) + ' entries (' +
+              ('listed' if(cache.misses > misses) else 'cached') + ')')
@@ -0,0 +1,245 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_enumerate.py
+# Version:      v07
+# Time-stamp:   <2026.10.19-03:41:52-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# "ls -d -- $b* | grep -a -E "^$g($r)" | sazae_check_candidates.py"を，
+# 1つのプロセスの中で，ディレクトリを1回走査して行います。
+#
+# os.scandirの項目（DirEntry）は，ディレクトリかシンボリックリンクかを
+# 走査の結果（d_type）から返すので，候補ごとにstatしません
+# （sazae_check_candidates.pyは，候補ごとにisdir，islink，statをします。）。
+# パーミッションを調べる場合だけ，その項目のstatを使います。
+# 一覧は，ディレクトリが変わるまで保持します（sazae_directory_cache.py）。
+# 一覧の名前は整列しているので，"$b*"の名前は二分探索した範囲になります。
+# 範囲の名前は，使う時に初めて"$b"のディレクトリの部分を付けるので，
+# migemoの正規表現で絞り込む（sazae_prefilter.py）範囲だけを作ります。
+#
+# 期限（deadline）を付ければ，ネットワークのファイルシステムでは，一覧を
+# 読むのも候補をチェックするのも別のスレッドで行い，期限までにできた
+# ところまでを返します（is_truncated）。チェックするスレッドは，
+# ディレクトリごとに1つだけで，前のものが終わっていなければ，新たには
+# 作りません（スレッドの数の上限もsazae_deadline.pyと共通）。
+#
+# $bのディレクトリの部分と最後の部分にワイルドカードがない場合に使い，
+# それ以外は，従来どおりglobで列挙します。
+#
+# 例：> ./sazae_enumerate.py '都道府県/' '^都道府県/(yama|山)' '' '' ''
+#     都道府県/山口県.txt
+#     都道府県/山形県.txt
+#     都道府県/山梨県.txt
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+
+from sazae_check_candidates import check_candidate
+from sazae_directory_cache import cache
+from sazae_deadline import Task, is_remote, is_busy
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v07'
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Candidates:
+    """A class viewing ranges of sorted names as candidates with a prefix"""
+
+    # rangesは，namesの範囲[i, j)の並び（昇順）
+    def __init__(self, prefix, names, ranges):
+        self.prefix = prefix
+        self.names = names
+        self.ranges = [(i, j) for i, j in ranges if(i < j)]
+        self.length = sum(j - i for i, j in self.ranges)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, k):
+        if(isinstance(k, slice)):
+            return [self[x] for x in range(*k.indices(self.length))]
+        if(k < 0):
+            k += self.length
+        for i, j in self.ranges:
+            if(k < j - i):
+                return self.prefix + self.names[i + k]
+            k -= j - i
+        raise IndexError(k)
+
+    def __iter__(self):
+        for i, j in self.ranges:
+            for n in self.names[i:j]:
+                yield self.prefix + n
+
+
+class Enumerator:
+    """A class listing the candidates of a directory with os.scandir"""
+
+    # baseは"$b"（ワイルドカードを含まない，"都道府県/yama"等）
+    # deadlineは，time.monotonicの時刻（Noneなら期限なし）
+    def __init__(self, base, deadline=None):
+        self.base = base
+        i = base.rfind('/') + 1
+        self.prefix = base[0:i]
+        self.head = base[i:]
+        self.directory = self.prefix if(self.prefix != '') else '.'
+        self.snapshot = None
+        self.deadline = deadline
+        # 期限までに一覧を読めなかったか，候補をチェックできなかったか
+        self.is_truncated = False
+
+    def get_snapshot(self):
+        if(self.snapshot is None):
+            if(self.deadline is None):
+                self.snapshot = cache.get(self.directory)
+            else:
+                self.snapshot, is_complete = cache.get_within(self.directory,
+                                                              self.deadline)
+                if(not is_complete):
+                    self.is_truncated = True
+        return self.snapshot
+
+    # "$b*"に相当する名前（整列済み，隠しファイルは"."で始まる場合だけ）
+    def list(self, pattern=None):
+        try:
+            snapshot = self.get_snapshot()
+        except OSError:
+            return []
+        i, j = snapshot.range(self.head)
+        if(self.head.startswith('.')):
+            ranges = [(i, j)]
+        else:
+            # "."で始まる名前も，整列した中では1つの範囲になる
+            k, m = snapshot.range('.', i, j)
+            ranges = [(i, k), (m, j)]
+        return Candidates(self.prefix, snapshot.names, ranges)
+
+    # 形式をチェックし，エスケープして返す（走査した項目はstatしない）
+    def check(self, candidates, mode, regexp, permission, pwd=''):
+        return list(self.iterate(candidates, mode, regexp, permission, pwd))
+
+    # checkと同じ（必要な候補だけ，順にチェックする）
+    def iterate(self, candidates, mode, regexp, permission, pwd=''):
+        if(pwd == ''):
+            pwd = os.getcwd()
+        try:
+            entries = self.get_snapshot().entries
+        except OSError:
+            entries = {}
+        if((self.deadline is None) or
+           (not is_remote(self.directory, self.deadline))):
+            yield from self.check_each(candidates, entries, mode, regexp,
+                                       permission, pwd)
+            return
+        # statで止まらないように，別のスレッドでチェックする
+        #   常駐するプロセスでは，カレントディレクトリの違う問合せが
+        #   混ざるので，絶対パスで
+        directory = os.path.abspath(self.directory)
+        task = checking.get(directory)
+        if(((task is not None) and (not task.is_done())) or is_busy()):
+            # 前のチェックがまだ止まっている
+            self.is_truncated = True
+            return
+        checked = []
+
+        def run():
+            for c in self.check_each(candidates, entries, mode, regexp,
+                                     permission, pwd):
+                checked.append(c)
+
+        task = Task(run)
+        checking[directory] = task
+        if(not task.wait(self.deadline)):
+            self.is_truncated = True
+        else:
+            del checking[directory]
+        yield from checked[:]
+
+    def check_each(self, candidates, entries, mode, regexp, permission, pwd):
+        for c in candidates:
+            e = None
+            if(c.startswith(self.prefix)):
+                e = entries.get(c[len(self.prefix):])
+            if(e is None):
+                # 一覧にない候補（前回の問合せの後に消えた候補等）
+                #   別のスレッドでは，カレントディレクトリが変わっても
+                #   よいように，絶対パスで
+                path = os.path.join(pwd, c)
+                is_directory = os.path.isdir(path)
+                is_link = os.path.islink(path)
+                get_mode = (lambda path=path: os.stat(path).st_mode)
+            else:
+                try:
+                    is_directory = e.is_dir()
+                except OSError:
+                    is_directory = False
+                is_link = e.is_symlink()
+                get_mode = (lambda e=e: e.stat().st_mode)
+            c_esc = check_candidate(c, is_directory, is_link, mode, regexp,
+                                    permission, pwd, get_mode)
+            if(c_esc is not None):
+                yield c_esc
+
+
+# ディレクトリ -> 候補をチェックしているTask（期限までに終わらなかったもの）
+checking = {}
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] +
+                  ' [$b] [regexp] [mode] [REGEXP] [permission]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    if(len(sys.argv) != 6):
+        sys.exit(2)
+    enumerator = Enumerator(sys.argv[1])
+    matcher = re.compile(sys.argv[2])
+    names = [n for n in enumerator.list() if matcher.match(n)]
+    for c in enumerator.check(names, sys.argv[3], sys.argv[4], sys.argv[5]):
+        print(c)
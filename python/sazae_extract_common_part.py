@@ -2,10 +2,10 @@
 # coding: utf-8
 #
 # Name:		~/.zshrc-sazae/python/sazae_extract_common_parts.py
-# Version:	v03
-# Time-stamp:   <2021.10.03-18:13:20-JST>
+# Version:	v05
+# Time-stamp:   <2026.10.19-04:17:09-JST>
 #
-# Copyright (C) 2017-2021  Seiichiro HATA
+# Copyright (C) 2017-2026  Seiichiro HATA
 #
 # This program is free software: you can redistribute it and/or modify
 # it under the terms of the GNU General Public License as published by
@@ -23,6 +23,8 @@
 #                                  概要
 #
 # 引数の先頭からの共通部分を抽出し，表示します。
+# エスケープの途中（末尾が"\"だけ）では切りません。
+# sazae_complete.pyからは，get_common_partを直接呼び出します。
 #
 # 例：> echo 'abcdef\nabcghi\nabcjkl' | ./sazae_extract_common_part.py
 #     abc
@@ -42,33 +44,9 @@ import re
 ############################################################
 
 
-VERSION = 'v03'
+VERSION = 'v05'
 PYTHON_VERSION = sys.version_info[0]
-
-
-############################################################
-# HELP AND VERSION
-############################################################
-
-
-if(len(sys.argv) == 2):
-    if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
-        print('Usage: ' + sys.argv[0] + ' [strings]')
-        print('Options:')
-        print('  -h, --help            show this message and exit')
-        print('  -v, --version         show version number and exit')
-        exit(0)
-    elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
-        print(sys.argv[0] + ' ' + VERSION)
-        exit(0)
-
-
-############################################################
-# GET CANDIDATES
-############################################################
-
-
-candidates = sys.stdin.read().splitlines()
+NOT_ESCAPED = '^((.*[^\\\\])?(\\\\\\\\)*)?'
 
 
 ############################################################
@@ -113,28 +91,58 @@ def adjust_backlash(s):
     return s
 
 
+# 標準入力の補完候補（"printf %b"で出力したもの）の共通部分
 def extract_common_part(c):
-    for i in range(len(c)):
-        c[i] = adjust_backlash(c[i])
+    c = [adjust_backlash(s) for s in c]
     if(PYTHON_VERSION == 2):
-        u = c[0].decode('utf-8')
-    else:
-        u = c[0]
-    for i in range(len(u)+1):
-        if(PYTHON_VERSION == 2):
-            t = u[0:i].encode('utf-8')
-        else:
-            t = u[0:i]
-        for j in range(len(c)):
-            if(j == 0):
-                continue
-            if(not c[j].startswith(t)):
-                return i - 1
-    return i
-
-
-p = extract_common_part(candidates)
-if(PYTHON_VERSION == 2):
-    print(candidates[0].decode('utf-8')[0:p].encode('utf-8'))
-else:
-    print(candidates[0][0:p])
+        c = [s.decode('utf-8') for s in c]
+        return get_common_part(c).encode('utf-8')
+    return get_common_part(c)
+
+
+# エスケープ済みの補完候補の共通部分
+def get_common_part(candidates):
+    if(len(candidates) == 0):
+        return ''
+    p = candidates[0]
+    for c in candidates[1:]:
+        i = 0
+        while((i < len(p)) and (i < len(c)) and (p[i] == c[i])):
+            i += 1
+        p = p[0:i]
+    # エスケープの途中で切れないように
+    if(re.match(NOT_ESCAPED + '\\\\$', p)):
+        p = p[:-1]
+    return p
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+
+    ############################################################
+    # HELP AND VERSION
+
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [strings]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+
+    ############################################################
+    # GET CANDIDATES
+
+    candidates = sys.stdin.read().splitlines()
+
+    ############################################################
+    # EXTRACT COMMON PART
+
+    print(extract_common_part(candidates))
@@ -0,0 +1,213 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_fuzzy.py
+# Version:      v01
+# Time-stamp:   <2026.10.18-21:52:30-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ローマ字の打ち間違い（"tokoy"，"yamaguti"等）を許して，ファイル名を探します。
+#
+# ファイル名の読み（sazae_reading_index.py）をローマ字にし（英数字の
+# ファイル名はそのまま），ローマ字の文字列（訓令式等はヘボン式にしたものも）
+# との編集距離が一定以下の先頭部分を持つファイル名を，距離の小さい順に返します。
+# 編集距離は，Myersのビット並列のアルゴリズムで，ローマ字の文字列の各文字を
+# 1ビットとし，ファイル名の1文字ごとに，全ての行の差分を整数の演算で更新します。
+# 先頭部分は，ローマ字の文字列の長さと距離の和より長くならないので，
+# それ以降の文字は調べません。また，ローマ字の文字列を距離より1つ多く
+# 分けた部分を1つも含まないものは，編集距離を計算せずに除きます。
+#
+# 例：> ./sazae_fuzzy.py -d /usr/share/cmigemo/utf-8/migemo-dict \
+#         -k 1 都道府県 yamaguti
+#     都道府県/山口県.txt
+#     都道府県/山形県.txt
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import unicodedata
+
+from sazae_reading_index import get_readings, invert_dictionary
+from sazae_romaji import hiragana_to_romaji, romaji_to_hiragana
+from sazae_migemo_dict import open_dictionaries
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v01'
+DISTANCE = 2
+MIN_KEY_LENGTH = 3   # これより短い文字列は，打ち間違いを許さない
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 文字ごとに，ローマ字の文字列でその文字がある位置のビット
+def make_peq(pattern):
+    peq = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    return peq
+
+
+# patternと，textの先頭部分との最小の編集距離（Myers，先頭を固定）
+#   limitを超えれば，limit + 1
+def prefix_distance(peq, m, text, limit):
+    mask = (1 << m) - 1
+    top = 1 << (m - 1)
+    pv = mask
+    mv = 0
+    score = m
+    best = m
+    for c in text[0:m + limit]:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if(ph & top):
+            score += 1
+        elif(mh & top):
+            score -= 1
+        if(score < best):
+            best = score
+        # 1行目（空の文字列との距離）は，1文字ごとに1増える
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return best if(best <= limit) else limit + 1
+
+
+# 照合するローマ字（訓令式等は，ヘボン式にしたものも）
+#   'yamaguti' -> ['yamaguti', 'yamaguchi']
+def get_patterns(key):
+    patterns = [key]
+    hiragana = romaji_to_hiragana(key)
+    if(len(hiragana) == 1):
+        r = hiragana_to_romaji(hiragana[0])
+        if(r != key):
+            patterns.append(r)
+    return patterns
+
+
+# 文字列をn個に分ける（距離がn - 1以下なら，どれかはそのまま含まれる）
+#   'yamaguti', 3 -> ['ya', 'mag', 'uti']
+def split_pieces(pattern, n):
+    m = len(pattern)
+    return [pattern[i * m // n:(i + 1) * m // n] for i in range(n)]
+
+
+# 距離の上限（短い文字列ほど小さくする）
+def get_limit(key, distance):
+    return min(distance, len(key) // 2)
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class FuzzyIndex:
+    """A class looking up names whose romaji readings are close to a key"""
+
+    def __init__(self, directory, inverted):
+        self.directory = directory
+        # ローマ字 -> ファイル名
+        self.names = {}
+        for name in os.listdir(directory):
+            readings = [unicodedata.normalize('NFKC', name).lower()]
+            readings.extend(hiragana_to_romaji(r)
+                            for r in get_readings(name, inverted))
+            for r in readings:
+                self.names.setdefault(r, []).append(name)
+
+    # 編集距離がdistance以下のファイル名（距離，名前の順）
+    def lookup(self, key, distance=DISTANCE):
+        key = key.lower()
+        limit = get_limit(key, distance)
+        if((len(key) < MIN_KEY_LENGTH) or (limit <= 0)):
+            return []
+        patterns = [(make_peq(p), len(p), split_pieces(p, limit + 1))
+                    for p in get_patterns(key)]
+        distances = {}
+        for r, names in self.names.items():
+            d = limit + 1
+            for peq, m, pieces in patterns:
+                head = r[0:m + limit]
+                # 分けた部分を1つも含まなければ，距離はlimitを超える
+                if(any(p in head for p in pieces)):
+                    d = min(d, prefix_distance(peq, m, head, limit))
+            if(d > limit):
+                continue
+            for n in names:
+                if(d < distances.get(n, limit + 1)):
+                    distances[n] = d
+        if(not key.startswith('.')):
+            for n in [n for n in distances if n.startswith('.')]:
+                del distances[n]
+        return sorted(distances, key=lambda n: (distances[n], n))
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] +
+                  ' [option] [directory] [string]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -d <dictionary>       specify migemo-dict')
+            print('  -k <number>           maximum edit distance')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    dictionary = ''
+    distance = DISTANCE
+    args = sys.argv[1:]
+    while(len(args) > 2):
+        a = args.pop(0)
+        if(a == '-d'):
+            dictionary = args.pop(0)
+        elif(a == '-k'):
+            distance = int(args.pop(0))
+    if(len(args) != 2):
+        sys.exit(2)
+    inverted = {}
+    if(dictionary != ''):
+        inverted = invert_dictionary(open_dictionaries(dictionary))
+    index = FuzzyIndex(args[0], inverted)
+    for n in index.lookup(args[1], distance):
+        print(os.path.join(args[0], n))
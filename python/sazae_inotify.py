@@ -0,0 +1,204 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_inotify.py
+# Version:      v01
+# Time-stamp:   <2026.10.18-23:06:12-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# Linuxのinotifyで，ディレクトリの中の作成，削除，名前の変更を監視します。
+#
+# 他のパッケージを使わないよう，ctypesでlibcの関数を呼び出します。
+# inotifyのない環境では，Inotify()がOSErrorを送出します。
+# ファイル記述子は非ブロックなので，read_eventsは，溜まった事象だけを
+# 返します（デーモンの中で，ディレクトリの一覧を使う前に読みます）。
+#
+# 監視の数は，利用者ごとの上限（/proc/sys/fs/inotify/max_user_watches）を
+# 他のプログラムと分け合うので，その一部（MAX_WATCHES以下）に抑えます。
+#
+# 例：> ./sazae_inotify.py 都道府県
+#     （別の端末で）> touch 都道府県/新潟県.txt
+#     CREATE 都道府県/新潟県.txt
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import errno
+import struct
+import select
+import ctypes
+import ctypes.util
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v01'
+MAX_WATCHES = 8192      # 監視するディレクトリの数の上限
+USER_WATCHES = '/proc/sys/fs/inotify/max_user_watches'
+EVENT = struct.Struct('iIII')
+BUFFER_SIZE = 65536
+
+# inotifyの事象
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+
+# ディレクトリの一覧に関わる事象
+WATCH_MASK = (IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF |
+              IN_ONLYDIR | IN_EXCL_UNLINK)
+
+NAMES = [(IN_ATTRIB, 'ATTRIB'), (IN_MOVED_FROM, 'MOVED_FROM'),
+         (IN_MOVED_TO, 'MOVED_TO'), (IN_CREATE, 'CREATE'),
+         (IN_DELETE, 'DELETE'), (IN_DELETE_SELF, 'DELETE_SELF'),
+         (IN_MOVE_SELF, 'MOVE_SELF'), (IN_Q_OVERFLOW, 'Q_OVERFLOW'),
+         (IN_IGNORED, 'IGNORED')]
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 監視できるディレクトリの数（利用者ごとの上限の半分，MAX_WATCHES以下）
+def get_watch_budget():
+    try:
+        with open(USER_WATCHES) as f:
+            return max(0, min(MAX_WATCHES, int(f.read()) // 2))
+    except (OSError, ValueError):
+        return MAX_WATCHES
+
+
+# 事象の名前
+#   IN_CREATE | IN_ISDIR -> 'CREATE'
+def get_event_name(mask):
+    return '|'.join(n for m, n in NAMES if(mask & m)) or hex(mask)
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Inotify:
+    """A class watching directories with the inotify API through ctypes"""
+
+    def __init__(self):
+        name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            self._init = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+        except (OSError, AttributeError):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                    ctypes.c_uint32]
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = self._init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if(self.fd < 0):
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        self.budget = get_watch_budget()
+
+    # 監視を加え，監視の番号を返す（同じディレクトリなら同じ番号）
+    def add_watch(self, path, mask=WATCH_MASK):
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if(wd < 0):
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._rm_watch(self.fd, wd)
+
+    # 溜まった事象（監視の番号，事象，名前）の並び
+    def read_events(self):
+        events = []
+        while(True):
+            try:
+                data = os.read(self.fd, BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            i = 0
+            while(i < len(data)):
+                wd, mask, _, length = EVENT.unpack_from(data, i)
+                i += EVENT.size
+                name = os.fsdecode(data[i:i + length].rstrip(b'\0'))
+                i += length
+                events.append((wd, mask, name))
+        return events
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if(self.fd >= 0):
+            os.close(self.fd)
+            self.fd = -1
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [directory...]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    if(len(sys.argv) < 2):
+        sys.exit(2)
+    inotify = Inotify()
+    directories = {}
+    for d in sys.argv[1:]:
+        directories[inotify.add_watch(d)] = d
+    try:
+        while(True):
+            select.select([inotify], [], [])
+            for wd, mask, name in inotify.read_events():
+                path = os.path.join(directories.get(wd, ''), name)
+                print(get_event_name(mask) + ' ' + path, flush=True)
+    except KeyboardInterrupt:
+        pass
+    inotify.close()
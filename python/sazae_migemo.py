@@ -0,0 +1,634 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_migemo.py
+# Version:      v18
+# Time-stamp:   <2026.10.19-03:27:33-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# migemoのコマンドで，ローマ字の文字列を正規表現に変換して表示します。
+#
+# デーモン（sazae_daemon.py）の中では，migemoのコマンドを対話モードで
+# 常駐させ（"cmigemo -q -d dict"は1行ずつ問合せを受け付けます。），
+# 辞書を読み込み直さずに問合せを処理します。
+# 常駐したプロセスは，落ちれば起動し直し，一定の回数の問合せの後に
+# 入れ替えます。
+# 1行ずつ応答しないコマンド（"migemo -t egrep | nkf -w"等で出力が
+# バッファリングされる場合）は，問合せのたびに起動します。
+# 1行ずつ応答するかは，最初の問合せで1回だけ確かめます（probe）。
+# 同じ文字列を，常駐させるプロセスと，1回だけ起動したコマンドに問い合わせ，
+# 後者が（辞書を読み込んで）応答してから少し（PROBE_TIMEOUT）待っても
+# 前者が応答しなければ，1行ずつ応答しないコマンドとみなします。
+#
+# 辞書（"-D"）を指定すれば，コマンドを起動せずに，pythonで実装したmigemo
+# （sazae_migemo_engine.py）で変換します。辞書は，更新されるまで保持します。
+#
+# コマンドの正規表現は，語のトライにして短くします（sazae_regexp_trie.py）。
+# 正規表現は，sazae_migemo_cache.pyで保存し，同じ問合せには変換せずに答えます。
+#
+# デーモンの中では，直前の問合せで一致したファイル名を覚えておき，
+# ローマ字を伸ばして補完する場合（"ya"の次に"yama"等）は，
+# ディレクトリを読み直さずに，そのファイル名だけを絞り込みます。
+#
+# 語彙のモード（"-V"）では，ディレクトリのファイル名の先頭の漢字や仮名を
+# 集めておき，辞書の語をそれと照合してから正規表現にします
+# （pythonで実装したmigemoの場合だけです。）。
+#
+# 漢字を含むファイル名のないディレクトリでは，辞書を使わずに，
+# ローマ字を仮名にするだけで正規表現を作れます（sazae_romaji.py）。
+#
+# 索引のモードでは，ファイル名の読みの索引（sazae_reading_index.py）を
+# ディレクトリごとに保持し，正規表現を使わずに候補を探します。
+# 打ち間違いを許す索引（sazae_fuzzy.py）も，ディレクトリごとに保持します。
+# 索引に使う逆にした辞書は，デーモンの外では，保存したものを開きます。
+#
+# 複数の文字列を渡すと，重複を除き，キャッシュにないものだけを
+# migemoに続けて送り（常駐させていなければ1回の起動で），1行ずつ表示します。
+#
+# 例：> ./sazae_migemo.py -c 'cmigemo -q -d /usr/share/cmigemo/utf-8/migemo-dict' \
+#         yama
+#     (山|やま|ヤマ|ﾔﾏ|...)
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+import time
+import glob
+import bisect
+import atexit
+import select
+import signal
+import subprocess
+
+from sazae_migemo_engine import MigemoEngine
+from sazae_migemo_dict import get_dictionary_mtime
+from sazae_migemo_cache import MigemoCache, get_cache_path, get_source
+from sazae_reading_index import ReadingIndex, invert_dictionary, \
+    open_inverted_dictionary
+from sazae_fuzzy import FuzzyIndex
+from sazae_regexp_trie import optimize
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v18'
+POOL_SIZE = 1        # 常駐させるプロセスの数
+MAX_QUERIES = 1000   # この回数の問合せの後にプロセスを入れ替える
+TIMEOUT = 5.0        # 応答を待つ秒数（辞書の読込みを含む）
+PROBE_TIMEOUT = 0.5  # 1回だけの起動の応答の後，常駐させたプロセスを待つ秒数
+RECEIVE_SIZE = 65536
+SAVE_INTERVAL = 16   # デーモンの中で，この数の変更ごとにキャッシュを保存
+MAX_VOCABULARIES = 64
+MAX_INDEXES = 64
+KANJI = re.compile('[\u3005\u3006\u3400-\u9fff\uf900-\ufaff]')
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 問合せのたびにコマンドを起動
+def run_once(command, key):
+    try:
+        p = subprocess.Popen(command, shell=True,
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL)
+        out, _ = p.communicate(key.encode('utf-8'))
+    except OSError:
+        return ''
+    return out.decode('utf-8', 'surrogateescape').strip('\n')
+
+
+# 1回の起動で複数の文字列を問い合わせる（1行ずつ応答しなければ，1つずつ）
+def run_many(command, keys):
+    if(len(keys) == 1):
+        return [run_once(command, keys[0])]
+    output = run_once(command, '\n'.join(keys))
+    lines = output.split('\n')
+    if(len(lines) != len(keys)):
+        return [run_once(command, k) for k in keys]
+    return lines
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class MigemoProcess:
+    """A class handling an interactive migemo process"""
+
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self.number_of_queries = 0
+        self.buffer = b''
+
+    def is_alive(self):
+        return (self.process is not None) and (self.process.poll() is None)
+
+    def start(self):
+        self.process = subprocess.Popen(self.command, shell=True, bufsize=0,
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL,
+                                        start_new_session=True)
+        self.number_of_queries = 0
+        self.buffer = b''
+
+    def stop(self):
+        if(self.process is None):
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            # パイプラインの場合に備えて，プロセスグループごと終了
+            os.killpg(self.process.pid, signal.SIGTERM)
+        except OSError:
+            pass
+        try:
+            self.process.wait(1)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        self.process.stdout.close()
+        self.process = None
+
+    def send(self, key):
+        self.process.stdin.write(key.encode('utf-8') + b'\n')
+        self.number_of_queries += 1
+
+    # 1行を受信（時間切れの場合はNone）
+    def receive(self, timeout):
+        fd = self.process.stdout.fileno()
+        deadline = time.time() + timeout
+        while(b'\n' not in self.buffer):
+            remaining = deadline - time.time()
+            if(remaining <= 0):
+                return None
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if(not readable):
+                return None
+            chunk = os.read(fd, RECEIVE_SIZE)
+            if(not chunk):
+                raise EOFError('migemo exited')
+            self.buffer = self.buffer + chunk
+        line, self.buffer = self.buffer.split(b'\n', 1)
+        return line.decode('utf-8', 'surrogateescape')
+
+
+class MigemoPool:
+    """A class multiplexing queries over resident migemo processes"""
+
+    def __init__(self, command, size=POOL_SIZE, max_queries=MAX_QUERIES,
+                 timeout=TIMEOUT):
+        self.command = command
+        self.processes = [MigemoProcess(command) for _ in range(size)]
+        self.max_queries = max_queries
+        self.timeout = timeout
+        self.next = 0
+        # 1行ずつ応答するか（Noneなら，まだ確かめていない）
+        self.is_interactive = None
+
+    def query(self, key):
+        if(key == ''):
+            return ''
+        if(self.is_interactive is None):
+            return self.probe(key)
+        if(not self.is_interactive):
+            return run_once(self.command, key)
+        # 落ちていたか時間切れの場合は，1回だけ起動し直す
+        for _ in range(2):
+            p = self._get_process()
+            try:
+                p.send(key)
+                line = p.receive(self.timeout)
+            except (OSError, EOFError):
+                p.stop()
+                continue
+            if(line is None):
+                # 1行ずつ応答するコマンドなので，止まったプロセスを起動し直す
+                p.stop()
+                continue
+            return line
+        return run_once(self.command, key)
+
+    # 1行ずつ応答するかを確かめ，1回だけ起動したコマンドの応答を返す
+    def probe(self, key):
+        p = self._get_process()
+        try:
+            p.send(key)
+        except OSError:
+            p.stop()
+        # 常駐させるプロセスも，この間に辞書を読み込む
+        answer = run_once(self.command, key)
+        line = None
+        if(p.is_alive()):
+            try:
+                line = p.receive(PROBE_TIMEOUT)
+            except (OSError, EOFError):
+                line = None
+        if(line is None):
+            # 1行ずつ応答しないので，以後は問合せのたびに起動
+            p.stop()
+            self.is_interactive = False
+        else:
+            self.is_interactive = True
+        return answer
+
+    # 複数の文字列を続けて送り，まとめて受信する
+    def query_many(self, keys):
+        if((len(keys) == 1) or ('' in keys)):
+            return [self.query(k) for k in keys]
+        if(self.is_interactive is None):
+            return [self.probe(keys[0])] + self.query_many(keys[1:])
+        if(not self.is_interactive):
+            return run_many(self.command, keys)
+        p = self._get_process()
+        try:
+            for k in keys:
+                p.send(k)
+            lines = [p.receive(self.timeout) for _ in keys]
+        except (OSError, EOFError):
+            lines = [None]
+        if(None in lines):
+            # 応答が揃わなければ，残りの応答と混ざらないように止め，
+            # 1つずつ待たずに，1回の起動でまとめて問い合わせる
+            p.stop()
+            return run_many(self.command, keys)
+        return lines
+
+    def _get_process(self):
+        p = self.processes[self.next]
+        self.next = (self.next + 1) % len(self.processes)
+        if(p.is_alive() and (p.number_of_queries >= self.max_queries)):
+            p.stop()
+        if(not p.is_alive()):
+            p.stop()
+            p.start()
+        return p
+
+    def stop(self):
+        for p in self.processes:
+            p.stop()
+
+
+class Incremental:
+    """A class keeping the names matched by the previous query"""
+
+    def __init__(self):
+        self.identity = None
+        self.key = ''
+        self.names = []
+
+    # ディレクトリと更新時刻（ディレクトリにglobの特殊文字があれば使わない）
+    def get_identity(self, source, pattern):
+        directory = os.path.dirname(pattern)
+        if(glob.has_magic(directory)):
+            return None
+        directory = os.path.abspath(directory)
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return None
+        return (source, os.path.abspath(pattern), mtime)
+
+    # 前回のファイル名を絞り込めるか
+    def get_names(self, source, pattern, key):
+        identity = self.get_identity(source, pattern)
+        if((identity is not None) and (identity == self.identity) and
+           key.startswith(self.key)):
+            return self.names
+        return None
+
+    # ローマ字が母音で終わっていれば，伸ばしても一致するものは増えない
+    # （"yak"の次の"yakka"は"やっか"になるので，"yak"からは絞り込めない）
+    def put_names(self, source, pattern, key, names):
+        if((key == '') or (key[-1].lower() not in 'aiueo-')):
+            return
+        self.identity = self.get_identity(source, pattern)
+        self.key = key
+        self.names = names
+
+
+class Vocabulary:
+    """A class holding the leading kanji and kana of the names"""
+
+    def __init__(self, directory):
+        heads = set()
+        # 漢字を含むファイル名があるか（なければ，仮名だけで補完できる）
+        self.has_kanji = False
+        for name in os.listdir(directory):
+            m = re.match('[^\\x00-\\x7f]+', name)
+            if(m):
+                heads.add(m.group(0))
+            if((not self.has_kanji) and KANJI.search(name)):
+                self.has_kanji = True
+        self.heads = sorted(heads)
+
+    # 語の先頭の漢字や仮名で始まるファイル名があるか（ASCIIで始まる語は残す）
+    def may_start(self, word):
+        m = re.match('[^\\x00-\\x7f]+', word)
+        if(not m):
+            return True
+        i = bisect.bisect_left(self.heads, m.group(0))
+        return (i < len(self.heads)) and self.heads[i].startswith(m.group(0))
+
+
+############################################################
+# POOLS
+############################################################
+
+
+# デーモンの中でだけ常駐させる（1回だけの起動では，常駐させる意味がない）
+is_persistent = False
+pools = {}
+engines = {}
+cache = None
+incremental = Incremental()
+vocabularies = {}
+inverted_dictionaries = {}
+indexes = {}
+fuzzy_indexes = {}
+
+
+def set_persistent(flag):
+    global is_persistent
+    is_persistent = flag
+
+
+def get_pool(command):
+    if(command not in pools):
+        pools[command] = MigemoPool(command)
+    return pools[command]
+
+
+# 辞書（利用者の辞書を含む）が更新されていれば，読み込み直す
+def get_engine(dictionary):
+    mtime = get_dictionary_mtime(dictionary)
+    if((dictionary not in engines) or (engines[dictionary][0] != mtime)):
+        if(dictionary in engines):
+            engines[dictionary][1].close()
+        engines[dictionary] = (mtime, MigemoEngine(dictionary))
+    return engines[dictionary][1]
+
+
+# ディレクトリが更新されていれば，語彙を作り直す
+def get_vocabulary(directory):
+    directory = os.path.abspath(directory)
+    mtime = os.stat(directory).st_mtime
+    if((directory in vocabularies) and
+       (vocabularies[directory][0] == mtime)):
+        return vocabularies[directory][1]
+    if(len(vocabularies) >= MAX_VOCABULARIES):
+        vocabularies.clear()
+    vocabularies[directory] = (mtime, Vocabulary(directory))
+    return vocabularies[directory][1]
+
+
+# 逆にした辞書（辞書が更新されていれば，作り直す）
+#   デーモンの外では，補完のたびに作り直さないよう，保存したものを開く
+def get_inverted_dictionary(dictionary):
+    mtime = get_dictionary_mtime(dictionary)
+    if((dictionary not in inverted_dictionaries) or
+       (inverted_dictionaries[dictionary][0] != mtime)):
+        if(is_persistent):
+            inverted = invert_dictionary(get_engine(dictionary).dictionary)
+        else:
+            inverted = open_inverted_dictionary(dictionary, mtime)
+        inverted_dictionaries[dictionary] = (mtime, inverted)
+        indexes.clear()
+        fuzzy_indexes.clear()
+    return inverted_dictionaries[dictionary][1]
+
+
+# ディレクトリが更新されていれば，索引を作り直す
+def get_reading_index(dictionary, directory):
+    inverted = get_inverted_dictionary(dictionary)
+    directory = os.path.abspath(directory)
+    mtime = os.stat(directory).st_mtime
+    if((directory in indexes) and (indexes[directory][0] == mtime)):
+        return indexes[directory][1]
+    if(len(indexes) >= MAX_INDEXES):
+        indexes.clear()
+    indexes[directory] = (mtime, ReadingIndex(directory, inverted))
+    return indexes[directory][1]
+
+
+# 読みの索引で探したファイル名
+def lookup_index(dictionary, directory, key):
+    try:
+        return get_reading_index(dictionary, directory).lookup(key)
+    except (OSError, IOError):
+        return []
+
+
+# ディレクトリが更新されていれば，打ち間違いを許す索引を作り直す
+def get_fuzzy_index(dictionary, directory):
+    inverted = get_inverted_dictionary(dictionary) if(dictionary != '') \
+        else {}
+    directory = os.path.abspath(directory)
+    mtime = os.stat(directory).st_mtime
+    if((directory in fuzzy_indexes) and
+       (fuzzy_indexes[directory][0] == mtime)):
+        return fuzzy_indexes[directory][1]
+    if(len(fuzzy_indexes) >= MAX_INDEXES):
+        fuzzy_indexes.clear()
+    fuzzy_indexes[directory] = (mtime, FuzzyIndex(directory, inverted))
+    return fuzzy_indexes[directory][1]
+
+
+# 読みのローマ字が打ち間違いの範囲で一致するファイル名（距離の小さい順）
+def lookup_fuzzy(dictionary, directory, key, distance):
+    try:
+        return get_fuzzy_index(dictionary, directory).lookup(key, distance)
+    except (OSError, IOError):
+        return []
+
+
+# ディレクトリに漢字を含むファイル名があるか（分からなければTrue）
+def needs_kanji(directory):
+    try:
+        return get_vocabulary(directory).has_kanji
+    except (OSError, IOError):
+        return True
+
+
+def get_cache():
+    global cache
+    if(cache is None):
+        cache = MigemoCache(get_cache_path())
+    return cache
+
+
+def query(command, key, dictionary='', directory=None):
+    return query_many(command, [key], dictionary, directory)[0]
+
+
+# 複数の文字列の正規表現（重複は除き，キャッシュにないものを1回で問い合わせる）
+def query_many(command, keys, dictionary='', directory=None):
+    if((command == '') and (dictionary == '')):
+        return ['' for _ in keys]
+    patterns = {'': ''}
+    if((directory is not None) and (dictionary != '')):
+        # 語彙はディレクトリごとに異なるので，キャッシュしない
+        try:
+            engine = get_engine(dictionary)
+            vocabulary = get_vocabulary(directory)
+            for k in keys:
+                if(k not in patterns):
+                    patterns[k] = engine.query(k, vocabulary)
+        except (OSError, IOError):
+            pass
+        return [patterns.get(k, '') for k in keys]
+    source, mtime = get_source(command, dictionary)
+    c = get_cache()
+    misses = []
+    for k in keys:
+        if(k not in patterns):
+            pattern = c.get(source, mtime, k)
+            if(pattern is None):
+                misses.append(k)
+                pattern = ''
+            patterns[k] = pattern
+    if(misses):
+        for k, pattern in zip(misses, convert_many(command, misses,
+                                                    dictionary)):
+            patterns[k] = pattern
+            if(pattern != ''):
+                c.put(source, mtime, k, pattern)
+        if(is_persistent and (c.changes >= SAVE_INTERVAL)):
+            c.save()
+    return [patterns[k] for k in keys]
+
+
+def convert(command, key, dictionary=''):
+    return convert_many(command, [key], dictionary)[0]
+
+
+def convert_many(command, keys, dictionary=''):
+    if(dictionary != ''):
+        try:
+            engine = get_engine(dictionary)
+            return [engine.query(k) for k in keys]
+        except (OSError, IOError):
+            return ['' for _ in keys]
+    if(command == ''):
+        return ['' for _ in keys]
+    if(not is_persistent):
+        return [optimize(p) for p in run_many(command, keys)]
+    return [optimize(p) for p in get_pool(command).query_many(keys)]
+
+
+# 候補のファイル名（デーモンの中では，前回のファイル名を絞り込む）
+#   prefilter（sazae_prefilter.py）があれば，照合の前に絞り込む
+#   lister（sazae_enumerate.py）があれば，globの代わりに使う
+#   narrowが偽なら，前回のファイル名を使わない（ネットワークのディレクトリ等）
+def get_names(command, key, dictionary, pattern, matcher, prefilter=None,
+              lister=None, narrow=True):
+    source = dictionary if(dictionary != '') else command
+    names = None
+    if(narrow):
+        names = incremental.get_names(source, pattern, key)
+    if(names is None):
+        names = lister(pattern) if(lister) else sorted(glob.glob(pattern))
+    if(prefilter is not None):
+        names = prefilter.filter(names, matcher)
+    else:
+        names = [n for n in names if matcher.match(n)]
+    if(is_persistent and narrow):
+        incremental.put_names(source, pattern, key, names)
+    return names
+
+
+def stop_all():
+    for pool in pools.values():
+        pool.stop()
+    pools.clear()
+    if(cache is not None):
+        cache.save()
+
+
+atexit.register(stop_all)
+
+
+# コマンドラインの処理（デーモンからも呼び出す）
+def main(args):
+    command = ''
+    dictionary = ''
+    directory = None
+    keys = []
+    while(args):
+        a = args.pop(0)
+        if((a == '-c') and args):
+            command = args.pop(0)
+        elif((a == '-D') and args):
+            dictionary = args.pop(0)
+        elif((a == '-V') and args):
+            directory = args.pop(0)
+        elif(a == '--stats'):
+            return 0, get_cache().get_statistics()
+        elif(a == '--clear'):
+            get_cache().clear()
+            return 0, get_cache().get_statistics()
+        else:
+            keys.append(a)
+    if(((command == '') and (dictionary == '')) or (len(keys) == 0)):
+        return 2, ''
+    # 複数の文字列は，1行ずつ
+    return 0, ''.join(p + '\n' for p in
+                      query_many(command, keys, dictionary, directory))
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option] [string...]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -c <command>          specify the migemo command')
+            print('  -D <dictionary>       use migemo-dict instead of the command')
+            print('  -V <directory>        use the vocabulary of the directory')
+            print('  --stats               show the statistics of the cache')
+            print('  --clear               clear the cache')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    status, output = main(sys.argv[1:])
+    sys.stdout.write(output)
+    sys.exit(status)
@@ -0,0 +1,267 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_migemo_cache.py
+# Version:      v04
+# Time-stamp:   <2026.10.19-04:05:38-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# migemoの正規表現を，（辞書，辞書の更新時刻，ローマ字）ごとに保存します。
+#
+# 最近使われていないものから捨て（LRU），一定の数（既定は256）を超えません。
+# 辞書が更新されれば，その辞書の正規表現を捨てます。
+# ~/.cache/sazae/migemo-cache.jsonに保存し，新しいシェルやデーモンでも
+# 使います。複数のシェルが保存する場合は，保存済みのものと併合します
+# （統計は，読み込んだ後の増分を，保存済みのものに加えます）。
+# 正規表現を使っただけ（ヒット）では保存しません。
+#
+# 例：> ./sazae_migemo_cache.py
+#     entries: 128/256
+#     hits: 1024
+#     misses: 128
+#     hit rate: 88.9%
+#     evictions: 0
+#     invalidations: 0
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+import json
+from collections import OrderedDict
+
+from sazae_migemo_dict import get_dictionary_mtime
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v04'
+CAPACITY = 256
+STATISTICS = ['hits', 'misses', 'evictions', 'invalidations']
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 保存するファイルの既定の場所
+def get_cache_path():
+    cache = os.environ.get('XDG_CACHE_HOME', '')
+    if(cache == ''):
+        cache = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'sazae', 'migemo-cache.json')
+
+
+# 辞書の識別（辞書がなければ，コマンドの"-d"の辞書）と更新時刻
+def get_source(command, dictionary):
+    path = dictionary
+    if(path == ''):
+        m = re.search('-d\\s+(\\S+)', command)
+        if(m):
+            path = m.group(1)
+    try:
+        if(dictionary == ''):
+            # コマンド（cmigemo等）は，利用者の辞書を読まない
+            mtime = os.stat(os.path.expanduser(path)).st_mtime
+        else:
+            # 利用者の辞書が更新されても，正規表現は変わる
+            mtime = get_dictionary_mtime(os.path.expanduser(path))
+    except OSError:
+        mtime = 0
+    if(dictionary == ''):
+        return command, mtime
+    return dictionary, mtime
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class MigemoCache:
+    """A class caching migemo regexps with LRU eviction"""
+
+    def __init__(self, path, capacity=CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        # (辞書, ローマ字) -> (更新時刻, 正規表現)
+        self.entries = OrderedDict()
+        self.statistics = dict((s, 0) for s in STATISTICS)
+        # 読み込んだ（保存した）時の統計（保存する時は，その後の増分を加える）
+        self.loaded = dict(self.statistics)
+        self.changes = 0  # 保存していない変更（追加，破棄）の数
+        self.load()
+
+    ########################################
+    # GET AND PUT
+    ########################################
+
+    def get(self, source, mtime, key):
+        entry = self.entries.get((source, key))
+        if(entry is not None):
+            if(entry[0] == mtime):
+                self.entries.move_to_end((source, key))
+                self.statistics['hits'] += 1
+                return entry[1]
+            # 辞書が更新された
+            self.invalidate(source, mtime)
+        self.statistics['misses'] += 1
+        return None
+
+    def put(self, source, mtime, key, pattern):
+        self.entries[(source, key)] = (mtime, pattern)
+        self.entries.move_to_end((source, key))
+        while(len(self.entries) > self.capacity):
+            self.entries.popitem(last=False)
+            self.statistics['evictions'] += 1
+        self.changes += 1
+
+    # 更新された辞書の正規表現を捨てる
+    def invalidate(self, source, mtime):
+        for k in [k for k, v in self.entries.items()
+                  if((k[0] == source) and (v[0] != mtime))]:
+            del self.entries[k]
+            self.statistics['invalidations'] += 1
+            self.changes += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.statistics = dict((s, 0) for s in STATISTICS)
+        self.loaded = dict(self.statistics)
+        self.changes += 1
+        self.save(merge=False)
+
+    ########################################
+    # LOAD AND SAVE
+    ########################################
+
+    def read(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            entries = [(tuple(e[0:2]), (e[2], e[3]))
+                       for e in data['entries']]
+            statistics = data['statistics']
+        except (OSError, IOError, ValueError, KeyError, TypeError,
+                IndexError):
+            return [], {}
+        return entries, statistics
+
+    def load(self):
+        entries, statistics = self.read()
+        for k, v in entries:
+            self.entries[k] = v
+        for s in STATISTICS:
+            self.statistics[s] = statistics.get(s, 0)
+        self.loaded = dict(self.statistics)
+
+    # 他のシェルが保存したものと併合して，一時ファイルから置き換える
+    def save(self, merge=True):
+        if(self.changes == 0):
+            return
+        entries = OrderedDict()
+        statistics = dict(self.statistics)
+        if(merge):
+            saved, saved_statistics = self.read()
+            for k, v in saved:
+                if(k not in self.entries):
+                    entries[k] = v
+            # 他のシェルが数えた分を消さないように，読み込んだ後の増分だけ
+            for s in STATISTICS:
+                statistics[s] = (saved_statistics.get(s, 0) +
+                                 self.statistics[s] - self.loaded[s])
+        entries.update(self.entries)
+        while(len(entries) > self.capacity):
+            entries.popitem(last=False)
+        data = {'entries': [[k[0], k[1], v[0], v[1]]
+                            for k, v in entries.items()],
+                'statistics': statistics}
+        directory = os.path.dirname(self.path)
+        try:
+            if(not os.path.isdir(directory)):
+                os.makedirs(directory)
+            temporary = self.path + '.' + str(os.getpid())
+            with open(temporary, 'w') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.rename(temporary, self.path)
+        except (OSError, IOError):
+            return
+        self.statistics = statistics
+        self.loaded = dict(statistics)
+        self.changes = 0
+
+    ########################################
+    # STATISTICS
+    ########################################
+
+    def get_statistics(self):
+        s = self.statistics
+        lines = ['entries: ' + str(len(self.entries)) + '/' +
+                 str(self.capacity),
+                 'hits: ' + str(s['hits']),
+                 'misses: ' + str(s['misses'])]
+        if(s['hits'] + s['misses'] > 0):
+            lines.append('hit rate: ' + '%.1f' %
+                         (100.0 * s['hits'] / (s['hits'] + s['misses'])) +
+                         '%')
+        lines.append('evictions: ' + str(s['evictions']))
+        lines.append('invalidations: ' + str(s['invalidations']))
+        return '\n'.join(lines) + '\n'
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -f <path>             specify the cache file')
+            print('  --clear               clear the cache')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    cache_path = get_cache_path()
+    is_clearing = False
+    args = sys.argv[1:]
+    while(args):
+        a = args.pop(0)
+        if(a == '-f' and args):
+            cache_path = args.pop(0)
+        elif(a == '--clear'):
+            is_clearing = True
+    cache = MigemoCache(cache_path)
+    if(is_clearing):
+        cache.clear()
+    sys.stdout.write(cache.get_statistics())
@@ -0,0 +1,575 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_migemo_dict.py
+# Version:      v05
+# Time-stamp:   <2026.10.19-02:24:50-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# migemoの辞書（migemo-dict）を扱います。
+#
+# "compile"で，migemo-dictと利用者の辞書を，読みの順に整列し，
+# 前方符号化（直前の読みとの共通部分の長さと，残りの部分）をした
+# バイナリの辞書にします。
+# コンパイル済みの辞書は，mmapで開き，ブロックの位置の表を二分探索して，
+# 読みが前方一致する語を探します（pythonのメモリに全体を読み込みません。）。
+#
+# 探した範囲は覚えておき，読みを伸ばして探す場合（"や"の次に"やま"等）は，
+# その範囲の中だけを探します。
+#
+# 利用者の辞書（~/.config/sazae/dict/*.txt，migemo-dictの形式）は，
+# ファイルごとに小さな辞書（~/.cache/sazae/user-dict/*.bin）にコンパイルし，
+# 本来の辞書に重ねて引きます（open_dictionaries）。
+# 利用者の辞書が更新されれば，そのファイルだけをコンパイルし直すので，
+# 語を加えても，本来の辞書をコンパイルし直す必要はありません。
+#
+# 逆にした辞書（語→読み，sazae_reading_index.py）も，同じ形式で
+# ~/.cache/sazae/inverted-dict.binに保存し，語と一致するものを引きます（get）。
+#
+# ファイルの構成（整数はリトルエンディアン）
+#   ヘッダ     マジック（8バイト），読みの数，ブロックの大きさ，
+#              ブロックの数，位置の表の位置，元の辞書の位置（各4バイト）
+#   ブロック   読みごとに，共通部分の長さ，残りの長さ，残り，
+#              語の長さ，語（タブ区切り）（長さは可変長整数）
+#              各ブロックの最初の読みは，共通部分の長さが0
+#   元の辞書   数，パスの長さ，パス，更新時刻（8バイトの浮動小数点数）
+#   位置の表   各ブロックの位置（各4バイト）
+#
+# 例：> ./sazae_migemo_dict.py compile -o ~/.cache/sazae/migemo-dict.bin \
+#         /usr/share/cmigemo/utf-8/migemo-dict
+#     > ./sazae_migemo_dict.py lookup -d ~/.cache/sazae/migemo-dict.bin やまが
+#     山形
+#     > ./sazae_migemo_dict.py update
+#     ~/.cache/sazae/user-dict/clients.bin: 1024 readings
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import mmap
+import heapq
+import bisect
+import struct
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v05'
+MAGIC = b'SAZAEMD\x01'
+HEADER = '<8sIIIII'
+HEADER_SIZE = struct.calcsize(HEADER)
+BLOCK_SIZE = 16
+MAX_CURSORS = 64
+USER_DICTIONARY_SUFFIX = '.txt'
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# コンパイル済みの辞書の既定の場所
+def get_compiled_path():
+    cache = os.environ.get('XDG_CACHE_HOME', '')
+    if(cache == ''):
+        cache = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'sazae', 'migemo-dict.bin')
+
+
+# 逆にした辞書の場所
+def get_inverted_path():
+    return os.path.join(os.path.dirname(get_compiled_path()),
+                        'inverted-dict.bin')
+
+
+# 利用者の辞書の場所
+def get_user_dictionary_directory():
+    config = os.environ.get('XDG_CONFIG_HOME', '')
+    if(config == ''):
+        config = os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(config, 'sazae', 'dict')
+
+
+# 利用者の辞書をコンパイルした辞書の場所
+def get_overlay_directory():
+    return os.path.join(os.path.dirname(get_compiled_path()), 'user-dict')
+
+
+def get_user_dictionaries(directory=None):
+    if(directory is None):
+        directory = get_user_dictionary_directory()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, n) for n in sorted(names)
+            if(n.endswith(USER_DICTIONARY_SUFFIX) and
+               os.path.isfile(os.path.join(directory, n)))]
+
+
+# 辞書の更新時刻（利用者の辞書の更新や削除を含む）
+def get_dictionary_mtime(path):
+    mtime = os.stat(path).st_mtime
+    directory = get_user_dictionary_directory()
+    try:
+        mtime = max(mtime, os.stat(directory).st_mtime)
+    except OSError:
+        return mtime
+    for s in get_user_dictionaries(directory):
+        try:
+            mtime = max(mtime, os.stat(s).st_mtime)
+        except OSError:
+            pass
+    return mtime
+
+
+def is_compiled(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# テキストの辞書の読込み（"読み<TAB>語<TAB>語..."，";"で始まる行は注釈）
+def read_dictionary(path, words=None):
+    if(words is None):
+        words = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.decode('utf-8', 'ignore').rstrip('\r\n')
+            if((line == '') or line.startswith(';')):
+                continue
+            fields = line.split('\t')
+            if(len(fields) < 2):
+                continue
+            found = words.setdefault(fields[0], [])
+            for w in fields[1:]:
+                if((w != '') and (w not in found)):
+                    found.append(w)
+    return words
+
+
+def encode_varint(n):
+    b = b''
+    while(n >= 0x80):
+        b = b + struct.pack('B', (n & 0x7f) | 0x80)
+        n = n >> 7
+    return b + struct.pack('B', n)
+
+
+def decode_varint(data, pos):
+    n = 0
+    shift = 0
+    while(True):
+        c = data[pos]
+        pos += 1
+        n = n | ((c & 0x7f) << shift)
+        if(c < 0x80):
+            return n, pos
+        shift += 7
+
+
+def common_length(a, b):
+    n = 0
+    while((n < len(a)) and (n < len(b)) and (a[n] == b[n])):
+        n += 1
+    return n
+
+
+# 辞書をコンパイル（一時ファイルに書き込んでから置き換える）
+def compile_dictionaries(sources, output, block_size=BLOCK_SIZE):
+    words = {}
+    for s in sources:
+        read_dictionary(s, words)
+    return write_dictionary(words, [(s, os.stat(s).st_mtime)
+                                    for s in sources], output, block_size)
+
+
+# 読み -> 語の並びを，コンパイルした辞書として書き込む
+#   sourcesは，元の辞書のパスと更新時刻の並び
+def write_dictionary(words, sources, output, block_size=BLOCK_SIZE):
+    entries = sorted((r.encode('utf-8'), '\t'.join(w).encode('utf-8'))
+                     for r, w in words.items())
+    chunks = []
+    offsets = []
+    position = HEADER_SIZE
+    previous = b''
+    for i, (reading, word) in enumerate(entries):
+        if(i % block_size == 0):
+            offsets.append(position)
+            previous = b''
+        n = common_length(previous, reading)
+        chunk = (encode_varint(n) + encode_varint(len(reading) - n) +
+                 reading[n:] + encode_varint(len(word)) + word)
+        chunks.append(chunk)
+        position += len(chunk)
+        previous = reading
+    body = b''.join(chunks)
+    sources_position = position
+    tail = encode_varint(len(sources))
+    for s, mtime in sources:
+        p = os.path.abspath(s).encode('utf-8', 'surrogateescape')
+        tail = tail + encode_varint(len(p)) + p + struct.pack('<d', mtime)
+    table_position = sources_position + len(tail)
+    header = struct.pack(HEADER, MAGIC, len(entries), block_size,
+                         len(offsets), table_position, sources_position)
+    table = struct.pack('<' + str(len(offsets)) + 'I', *offsets)
+    directory = os.path.dirname(os.path.abspath(output))
+    if(not os.path.isdir(directory)):
+        os.makedirs(directory)
+    temporary = output + '.' + str(os.getpid())
+    with open(temporary, 'wb') as f:
+        f.write(header + body + tail + table)
+    os.rename(temporary, output)
+    return len(entries)
+
+
+# 利用者の辞書のうち，更新されたものだけをコンパイル（コンパイルした辞書）
+def update_overlays(sources=None, directory=None, verbose=False):
+    if(sources is None):
+        sources = get_user_dictionaries()
+    if(directory is None):
+        directory = get_overlay_directory()
+    overlays = []
+    for s in sources:
+        name = os.path.basename(s)[0:-len(USER_DICTIONARY_SUFFIX)]
+        overlay = os.path.join(directory, name + '.bin')
+        try:
+            mtime = os.stat(s).st_mtime
+            if(is_overlay_current(overlay, s, mtime)):
+                overlays.append(overlay)
+                continue
+            number = compile_dictionaries([s], overlay)
+        except (OSError, IOError):
+            continue
+        overlays.append(overlay)
+        if(verbose):
+            print(overlay + ': ' + str(number) + ' readings')
+    # 削除された利用者の辞書のもの
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    for n in names:
+        p = os.path.join(directory, n)
+        if(n.endswith('.bin') and (p not in overlays)):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+    return overlays
+
+
+def is_overlay_current(overlay, source, mtime):
+    if(not (os.path.isfile(overlay) and is_compiled(overlay))):
+        return False
+    d = CompiledDictionary(overlay)
+    try:
+        return d.get_sources() == [(os.path.abspath(source), mtime)]
+    finally:
+        d.close()
+
+
+# 探した読みの範囲（前方一致する最長の読みの範囲）
+class Cursors:
+    """A class remembering the ranges of the previous lookups"""
+
+    def __init__(self):
+        self.ranges = {}
+
+    def get(self, prefix, lo, hi):
+        for i in range(len(prefix), 0, -1):
+            if(prefix[0:i] in self.ranges):
+                return self.ranges[prefix[0:i]]
+        return lo, hi
+
+    def put(self, prefix, lo, hi):
+        if(len(self.ranges) >= MAX_CURSORS):
+            self.ranges.clear()
+        self.ranges[prefix] = (lo, hi)
+
+
+# テキストかコンパイル済みかに応じて，辞書を開く
+def open_dictionary(path):
+    if(is_compiled(path)):
+        return CompiledDictionary(path)
+    return TextDictionary(path)
+
+
+# 辞書を開き，利用者の辞書を重ねる
+def open_dictionaries(path):
+    dictionary = open_dictionary(path)
+    overlays = []
+    for o in update_overlays():
+        try:
+            overlays.append(CompiledDictionary(o))
+        except (OSError, IOError, ValueError):
+            pass
+    if(not overlays):
+        return dictionary
+    return MergedDictionary([dictionary] + overlays)
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class TextDictionary:
+    """A class looking up migemo-dict loaded into memory"""
+
+    def __init__(self, path):
+        self.path = path
+        self.words = read_dictionary(path)
+        self.readings = sorted(self.words)
+        self.cursors = Cursors()
+
+    # 読みが前方一致する語（読みの整列済みの配列を二分探索）
+    def lookup(self, prefix):
+        found = []
+        lo, hi = self.cursors.get(prefix, 0, len(self.readings))
+        i = bisect.bisect_left(self.readings, prefix, lo, hi)
+        j = i
+        while((j < hi) and self.readings[j].startswith(prefix)):
+            found.extend(self.words[self.readings[j]])
+            j += 1
+        self.cursors.put(prefix, i, j)
+        return found
+
+    # 全ての読みと語
+    def items(self):
+        for r in self.readings:
+            yield r, self.words[r]
+
+    def close(self):
+        pass
+
+
+class CompiledDictionary:
+    """A class looking up a compiled dictionary through mmap"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.number_of_entries, self.block_size,
+         self.number_of_blocks, self.table_position,
+         self.sources_position) = struct.unpack_from(HEADER, self.map, 0)
+        if(magic != MAGIC):
+            self.close()
+            raise ValueError('not a compiled dictionary: ' + path)
+        self.cursors = Cursors()
+        # 各ブロックの最初の読み（getで初めて使う時に作る）
+        self.first_readings = None
+
+    def close(self):
+        if(self.map is not None):
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def get_block_position(self, i):
+        return struct.unpack_from('<I', self.map,
+                                  self.table_position + 4 * i)[0]
+
+    # ブロックの最初の読み（共通部分の長さは0）
+    def get_first_reading(self, i):
+        pos = self.get_block_position(i)
+        _, pos = decode_varint(self.map, pos)
+        length, pos = decode_varint(self.map, pos)
+        return self.map[pos:pos + length]
+
+    # ブロックの先頭から，読みと語の位置を順に返す
+    def entries(self, block=0):
+        pos = self.get_block_position(block) if(self.number_of_blocks) \
+            else HEADER_SIZE
+        reading = b''
+        for _ in range(block * self.block_size, self.number_of_entries):
+            n, pos = decode_varint(self.map, pos)
+            length, pos = decode_varint(self.map, pos)
+            reading = reading[0:n] + self.map[pos:pos + length]
+            pos += length
+            length, pos = decode_varint(self.map, pos)
+            yield reading, pos, length
+            pos += length
+
+    # 読みが前方一致する語
+    def lookup(self, prefix):
+        found = []
+        if(self.number_of_blocks == 0):
+            return found
+        p = prefix.encode('utf-8')
+        first, last = self.cursors.get(prefix, 0, self.number_of_blocks)
+        # 最初の読みがp以下である最後のブロック
+        lo = first
+        hi = last
+        while(lo < hi):
+            mid = (lo + hi) // 2
+            if(self.get_first_reading(mid) <= p):
+                lo = mid + 1
+            else:
+                hi = mid
+        first = max(lo - 1, first)
+        last = first + 1
+        for i, (reading, pos, length) in enumerate(self.entries(first)):
+            if(reading.startswith(p)):
+                found.extend(self.map[pos:pos + length]
+                             .decode('utf-8').split('\t'))
+                last = first + i // self.block_size + 1
+            elif(reading > p):
+                break
+        self.cursors.put(prefix, first, last)
+        return found
+
+    # 読みと一致する語（なければdefault）
+    def get(self, reading, default=None):
+        if(self.number_of_blocks == 0):
+            return default
+        if(self.first_readings is None):
+            self.first_readings = [self.get_first_reading(i)
+                                   for i in range(self.number_of_blocks)]
+        p = reading.encode('utf-8')
+        # 読みは，最初の読みがp以下である最後のブロックの中
+        i = bisect.bisect_right(self.first_readings, p)
+        for r, pos, length in self.entries(max(i - 1, 0)):
+            if(r == p):
+                return self.map[pos:pos + length].decode('utf-8').split('\t')
+            if(r > p):
+                break
+        return default
+
+    # 全ての読みと語
+    def items(self):
+        for reading, pos, length in self.entries():
+            yield (reading.decode('utf-8'),
+                   self.map[pos:pos + length].decode('utf-8').split('\t'))
+
+    # 元の辞書のパスと更新時刻
+    def get_sources(self):
+        sources = []
+        number, pos = decode_varint(self.map, self.sources_position)
+        for _ in range(number):
+            length, pos = decode_varint(self.map, pos)
+            path = self.map[pos:pos + length].decode('utf-8',
+                                                     'surrogateescape')
+            pos += length
+            mtime = struct.unpack_from('<d', self.map, pos)[0]
+            pos += 8
+            sources.append((path, mtime))
+        return sources
+
+
+class MergedDictionary:
+    """A class looking up a dictionary with user dictionaries over it"""
+
+    def __init__(self, dictionaries):
+        self.dictionaries = dictionaries
+        self.path = dictionaries[0].path
+
+    # 読みが前方一致する語（重複は除く）
+    def lookup(self, prefix):
+        found = []
+        seen = set()
+        for d in self.dictionaries:
+            for w in d.lookup(prefix):
+                if(w not in seen):
+                    seen.add(w)
+                    found.append(w)
+        return found
+
+    # 全ての読みと語（読みの順に併合する）
+    def items(self):
+        reading = None
+        words = []
+        for r, w in heapq.merge(*[d.items() for d in self.dictionaries],
+                                key=lambda item: item[0]):
+            if(r != reading):
+                if(reading is not None):
+                    yield reading, words
+                reading = r
+                words = []
+            words.extend(x for x in w if x not in words)
+        if(reading is not None):
+            yield reading, words
+
+    def close(self):
+        for d in self.dictionaries:
+            d.close()
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if((len(sys.argv) < 3) and (sys.argv[1:] != ['update'])):
+        if((len(sys.argv) == 2) and
+           (sys.argv[1] == '-v' or sys.argv[1] == '--version')):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+        print('Usage: ' + sys.argv[0] + ' compile [-o output] [dictionaries]')
+        print('       ' + sys.argv[0] + ' update')
+        print('       ' + sys.argv[0] + ' lookup [-d dictionary] [reading]')
+        print('Options:')
+        print('  -h, --help            show this message and exit')
+        print('  -v, --version         show version number and exit')
+        print('  -o <path>             specify the compiled dictionary')
+        print('  -d <path>             specify the dictionary to look up')
+        exit(0)
+    command = sys.argv[1]
+    output = get_compiled_path()
+    args = sys.argv[2:]
+    paths = []
+    while(args):
+        a = args.pop(0)
+        if((a == '-o' or a == '-d') and args):
+            output = args.pop(0)
+        else:
+            paths.append(a)
+    paths = [p for p in paths if p != '']
+    if(command == 'compile'):
+        if(not paths):
+            # 前回と同じ辞書でコンパイルし直す
+            if(os.path.isfile(output) and is_compiled(output)):
+                d = CompiledDictionary(output)
+                paths = [p for p, _ in d.get_sources()]
+                d.close()
+        paths = [p for p in paths if os.path.isfile(p)]
+        if(not paths):
+            sys.stderr.write(sys.argv[0] + ': dictionary not found\n')
+            sys.exit(1)
+        number = compile_dictionaries(paths, output)
+        print(output + ': ' + str(number) + ' readings')
+    elif(command == 'update'):
+        # 更新された利用者の辞書だけをコンパイル
+        update_overlays(verbose=True)
+    elif(command == 'lookup'):
+        d = open_dictionaries(output)
+        for p in paths:
+            for w in d.lookup(p):
+                print(w)
+        d.close()
+    else:
+        sys.exit(2)
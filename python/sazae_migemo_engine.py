@@ -0,0 +1,159 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_migemo_engine.py
+# Version:      v06
+# Time-stamp:   <2026.10.18-20:33:40-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# cmigemoの辞書（migemo-dict）を読み込み，ローマ字の文字列を
+# 正規表現に変換します（cmigemoがない環境のためのmigemoです）。
+#
+# ローマ字を平仮名に変換し（sazae_romaji.py），平仮名，片仮名，半角片仮名と，
+# 読みがその平仮名で始まる辞書の語を，選択の正規表現にします。
+# 語は，トライにして共通の接頭辞をくくり出します（sazae_regexp_trie.py）。
+# 正規表現は，pythonのreとgrep -Eのどちらでも使えます。
+# 大文字で区切られた部分（"kensakuEngine"等）は，それぞれ変換して連結します。
+#
+# 辞書は，コンパイル済みの辞書（sazae_migemo_dict.py）でも構いません。
+# 利用者の辞書（~/.config/sazae/dict/*.txt）があれば，重ねて引きます。
+#
+# ディレクトリの語彙（ファイル名の先頭の漢字や仮名）を渡せば，
+# 最初の部分の語を，ファイル名の先頭になり得るものだけに絞ります。
+#
+# "-w"がなければ，cmigemoと同様に，標準入力から1行ずつ読み込みます。
+#
+# 例：> ./sazae_migemo_engine.py -d /usr/share/cmigemo/utf-8/migemo-dict \
+#         -w yama
+#     (やま|ヤマ|大和|山羊?|ﾔﾏ|...)
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+
+from sazae_migemo_dict import open_dictionaries
+from sazae_regexp_trie import build
+from sazae_romaji import romaji_to_hiragana, to_katakana, to_half_width, \
+    to_full_width
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v06'
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class MigemoEngine:
+    """A class converting romaji into a regexp with migemo-dict"""
+
+    def __init__(self, path):
+        self.path = path
+        self.dictionary = open_dictionaries(path)
+
+    # 読みが前方一致する語
+    def lookup(self, prefix):
+        return self.dictionary.lookup(prefix)
+
+    def close(self):
+        self.dictionary.close()
+
+    # 大文字で区切られていない部分の語
+    def get_words(self, segment):
+        words = [segment, to_full_width(segment)]
+        words.extend(self.lookup(segment.lower()))
+        for h in romaji_to_hiragana(segment):
+            words.extend(self.lookup(h))
+            words.extend([h, to_katakana(h), to_half_width(h)])
+        found = []
+        seen = set()
+        for w in words:
+            if(w not in seen):
+                seen.add(w)
+                found.append(w)
+        return found
+
+    def query(self, key, vocabulary=None):
+        pattern = ''
+        for segment in re.findall('[A-Z]?[^A-Z]*', key):
+            if(segment == ''):
+                continue
+            words = self.get_words(segment)
+            if((vocabulary is not None) and (pattern == '')):
+                words = [w for w in words if vocabulary.may_start(w)]
+            pattern = pattern + build(words)
+        return pattern
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' -d [dictionary] [option]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -d <dictionary>       specify migemo-dict')
+            print('  -w <word>             convert the word and exit')
+            print('  -q                    quiet mode (same as cmigemo)')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    dictionary = ''
+    word = None
+    args = sys.argv[1:]
+    while(args):
+        a = args.pop(0)
+        if(a == '-d' and args):
+            dictionary = args.pop(0)
+        elif(a == '-w' and args):
+            word = args.pop(0)
+        elif(a == '-q'):
+            pass  # cmigemoとの互換のため
+    if(not os.path.isfile(dictionary)):
+        sys.stderr.write(sys.argv[0] + ': dictionary not found\n')
+        sys.exit(1)
+    engine = MigemoEngine(dictionary)
+    if(word is not None):
+        print(engine.query(word))
+        sys.exit(0)
+    # cmigemoと同様に，1行ずつ応答する
+    while(True):
+        line = sys.stdin.readline()
+        if(line == ''):
+            break
+        sys.stdout.write(engine.query(line.rstrip('\r\n')) + '\n')
+        sys.stdout.flush()
@@ -0,0 +1,189 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_path_search.py
+# Version:      v02
+# Time-stamp:   <2026.10.18-22:54:37-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# パスの全ての部分にmigemoを適用して補完します（"/ho-mu/kawa"で
+# "/ホーム/kawai"等）。
+#
+# 各部分の末尾のアルファベットと数字をmigemoの文字列とし，全ての部分の
+# 正規表現を1回で問い合わせます（sazae_migemo.query_many）。
+# ディレクトリを1階層ずつたどり，途中の部分は名前の全体が，最後の部分は
+# 名前の先頭が一致するものだけを残すので，組合せは爆発しません。
+# たどるディレクトリの数は，階層ごとに一定（MAX_BRANCHES）までです。
+# ディレクトリの一覧（sazae_directory_cache.py）と部分ごとの正規表現は，
+# デーモンの中では保持します。
+#
+# 例：> ./sazae_path_search.py -D /usr/share/cmigemo/utf-8/migemo-dict \
+#         /ho-mu/kawa
+#     /ホーム/kawai
+#     /ホーム/河田
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+from collections import OrderedDict
+
+import sazae_migemo
+from sazae_directory_cache import list_directory
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v02'
+MAX_BRANCHES = 64    # 階層ごとにたどるディレクトリの数
+MAX_MATCHERS = 256
+# 部分の文字列と，migemoの文字列（末尾のアルファベットと数字）
+SEGMENT = re.compile('(.*?)-*([a-zA-Z0-9][a-zA-Z0-9\\-]*)?', re.S)
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# パスを，最初の"/"と部分に
+#   '/ho-mu/kawa' -> ('/', ['ho-mu', 'kawa'])
+def split_path(path):
+    root = '/' if(path.startswith('/')) else ''
+    return root, path[len(root):].split('/')
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class PathSearch:
+    """A class completing a path with migemo applied to every segment"""
+
+    def __init__(self, migemo_command='', migemo_dictionary=''):
+        self.migemo_command = migemo_command
+        self.migemo_dictionary = migemo_dictionary
+
+    # 部分ごとの正規表現（キャッシュにないものを，1回で問い合わせる）
+    def get_matchers(self, segments):
+        source = (self.migemo_command, self.migemo_dictionary)
+        missing = [s for s in segments if((source, s) not in matchers)]
+        keys = [SEGMENT.fullmatch(s).group(2) or '' for s in missing]
+        regexps = sazae_migemo.query_many(self.migemo_command, keys,
+                                          self.migemo_dictionary)
+        for s, k, r in zip(missing, keys, regexps):
+            literal = SEGMENT.fullmatch(s).group(1)
+            pattern = re.escape(s)
+            if(r != ''):
+                pattern = pattern + '|' + re.escape(literal) + '(' + r + ')'
+            try:
+                matchers[(source, s)] = re.compile('(' + pattern + ')')
+            except re.error:
+                matchers[(source, s)] = re.compile(re.escape(s))
+        while(len(matchers) > MAX_MATCHERS):
+            matchers.popitem(last=False)
+        found = []
+        for s in segments:
+            matchers.move_to_end((source, s))
+            found.append(matchers[(source, s)])
+        return found
+
+    # 部分に一致する名前（途中の部分は全体，最後の部分は先頭）
+    def match(self, directory, segment, matcher, is_last):
+        if((segment in ['.', '..']) or ((segment == '') and not is_last)):
+            return [segment]
+        found = []
+        for n in list_directory(directory if(directory != '') else '.'):
+            if(n.startswith('.') and not segment.startswith('.')):
+                continue
+            m = matcher.match(n) if(is_last) else matcher.fullmatch(n)
+            if(m):
+                found.append(n)
+        return found
+
+    def search(self, path):
+        root, segments = split_path(path)
+        if(len(segments) < 2):
+            return []
+        patterns = self.get_matchers(segments)
+        directories = [root]
+        for i, (s, m) in enumerate(zip(segments, patterns)):
+            is_last = (i == len(segments) - 1)
+            following = []
+            for d in directories:
+                for n in self.match(d, s, m, is_last):
+                    p = d + n
+                    if(is_last):
+                        following.append(p)
+                    elif(os.path.isdir(p if(p != '') else '.')):
+                        following.append(p + '/')
+            if(is_last):
+                return following
+            # 組合せが増え過ぎないように，たどるディレクトリを絞る
+            directories = following[0:MAX_BRANCHES]
+            if(not directories):
+                return []
+        return []
+
+
+# (migemo, 部分) -> 正規表現
+matchers = OrderedDict()
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option] [path]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -m <command>          specify the migemo command')
+            print('  -D <dictionary>       use migemo-dict instead of the command')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    migemo_command = ''
+    migemo_dictionary = ''
+    args = sys.argv[1:]
+    while(len(args) > 1):
+        a = args.pop(0)
+        if(a == '-m'):
+            migemo_command = args.pop(0)
+        elif(a == '-D'):
+            migemo_dictionary = args.pop(0)
+    if(len(args) != 1):
+        sys.exit(2)
+    search = PathSearch(migemo_command, migemo_dictionary)
+    for p in search.search(args[0]):
+        print(p)
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_prefilter.py
+# Version:      v01
+# Time-stamp:   <2026.10.18-18:48:27-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ファイル名を正規表現（"^$g($r)"）で照合する前に，大半のファイル名を
+# 文字の比較だけで除きます。
+#
+# $gにワイルドカードがなければ，ファイル名は$gの文字列で始まり，
+# その次の文字は，migemoの正規表現の先頭になり得る文字です。
+# また，migemoの語に共通の接頭辞（"(山[口形]?|山梨)"の"山"）があれば，
+# ファイル名は"$g山"で始まります。
+# ファイル名は整列しているので，この2つを満たすファイル名の範囲を二分探索し，
+# その範囲のファイル名だけを，正規表現で照合します。
+# ファイル名の数が正規表現に比べて少なければ，正規表現を解析せずに照合します。
+#
+# 例：> ls | ./sazae_prefilter.py '' '(山[口形]?|やま)'
+#     山口県.txt
+#     山形県.txt
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import re
+import bisect
+from collections import OrderedDict
+
+from sazae_regexp_trie import first_characters, required_prefix
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v01'
+RATIO = 2           # ファイル名の数が正規表現の長さのこの倍以上なら解析する
+MAX_ANALYSES = 16
+MAX_CHARACTER = chr(sys.maxunicode)
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# hで始まる文字列の範囲の上限（hで始まる文字列は[h, 上限)，上限がなければNone）
+def get_successor(h):
+    h = h.rstrip(MAX_CHARACTER)
+    if(h == ''):
+        return None
+    return h[0:-1] + chr(ord(h[-1]) + 1)
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Prefilter:
+    """A class rejecting names before matching them with a regexp"""
+
+    # literalは$gの文字列（ワイルドカードがあればNone）
+    def __init__(self, literal, regexp):
+        self.literal = literal
+        self.regexp = regexp
+
+    # 先頭になり得る文字と，必ず始まる文字列（デーモンの中では保持する）
+    def analyse(self):
+        analysis = analyses.get(self.regexp)
+        if(analysis is None):
+            analysis = (first_characters(self.regexp),
+                        required_prefix(self.regexp))
+            analyses[self.regexp] = analysis
+            while(len(analyses) > MAX_ANALYSES):
+                analyses.popitem(last=False)
+        return analysis
+
+    # ファイル名の先頭（$gの文字列と，その次の文字や接頭辞）
+    def get_heads(self, names):
+        if((len(names) < RATIO * len(self.regexp)) and
+           (self.regexp not in analyses)):
+            # 正規表現の解析のほうが時間がかかる
+            return [self.literal]
+        characters, prefix = self.analyse()
+        if(prefix != ''):
+            return [self.literal + prefix]
+        if(characters is None):
+            return [self.literal]
+        return [self.literal + c for c in sorted(characters)]
+
+    # namesは整列済み（先頭ごとの範囲を二分探索し，その範囲だけを照合する）
+    def filter(self, names, matcher):
+        if(self.literal is None):
+            return list(filter(matcher.match, names))
+        found = []
+        for h in self.get_heads(names):
+            i = bisect.bisect_left(names, h)
+            successor = get_successor(h)
+            if(successor is None):
+                j = len(names)
+            else:
+                j = bisect.bisect_left(names, successor, i)
+            found.extend(filter(matcher.match, names[i:j]))
+        return found
+
+
+# 正規表現 -> (先頭になり得る文字, 接頭辞)
+analyses = OrderedDict()
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [literal] [regexp]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    if(len(sys.argv) != 3):
+        sys.exit(2)
+    prefilter = Prefilter(sys.argv[1], sys.argv[2])
+    matcher = re.compile('^' + re.escape(sys.argv[1]) + sys.argv[2])
+    for n in prefilter.filter(sorted(sys.stdin.read().splitlines()), matcher):
+        print(n)
@@ -0,0 +1,216 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_reading_index.py
+# Version:      v04
+# Time-stamp:   <2026.10.19-02:29:15-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ディレクトリのファイル名の読みの索引を作り，ローマ字で検索します。
+#
+# migemoの辞書を逆にして（語→読み），ファイル名の先頭を語と仮名に分け，
+# その読み（平仮名）を並べた索引を作ります（"山口県.txt"→"やまぐちけん"）。
+# ローマ字は平仮名に変換して，索引を二分探索し，読みが前方一致する
+# ファイル名を返します（正規表現で全てのファイル名を調べません。）。
+# 索引は，ディレクトリの更新時刻が変われば作り直します。
+#
+# 逆にした辞書は，コンパイルした辞書の形式で保存し（sazae_migemo_dict.py），
+# 辞書が更新されるまで使います（open_inverted_dictionary）。デーモンの外で，
+# 補完のたびに辞書の全体を逆にしないためです。
+#
+# 例：> ./sazae_reading_index.py -d /usr/share/cmigemo/utf-8/migemo-dict \
+#         都道府県 yama
+#     山口県.txt
+#     山形県.txt
+#     山梨県.txt
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import bisect
+import unicodedata
+
+from sazae_migemo_dict import open_dictionaries, write_dictionary, \
+    get_inverted_path, CompiledDictionary
+from sazae_romaji import romaji_to_hiragana
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v04'
+MAX_WORDS = 3        # 読みを作るファイル名の先頭の語の数
+MAX_WORD_LENGTH = 8
+MAX_READINGS = 16    # ファイル名ごとの読みの数
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+def is_kana(c):
+    return ('ぁ' <= c <= 'ゖ') or ('ァ' <= c <= 'ヶ') or (c == 'ー')
+
+
+def is_japanese(c):
+    return ord(c) >= 0x3000
+
+
+def to_hiragana(s):
+    return ''.join(chr(ord(c) - 0x60) if('ァ' <= c <= 'ヶ') else c
+                   for c in s)
+
+
+# 辞書を逆にする（語→読み，漢字を含む語だけ）
+def invert_dictionary(dictionary):
+    inverted = {}
+    for reading, words in dictionary.items():
+        for w in words:
+            if((len(w) <= MAX_WORD_LENGTH) and
+               any(is_japanese(c) and not is_kana(c) for c in w)):
+                found = inverted.setdefault(w, [])
+                if(reading not in found):
+                    found.append(reading)
+    return inverted
+
+
+# 保存した逆にした辞書（辞書の更新時刻mtimeと異なれば，作り直して保存）
+#   保存できなければ，作り直したもの（dict）
+def open_inverted_dictionary(dictionary, mtime, path=None):
+    if(path is None):
+        path = get_inverted_path()
+    sources = [(os.path.abspath(dictionary), mtime)]
+    try:
+        inverted = CompiledDictionary(path)
+        if(inverted.get_sources() == sources):
+            return inverted
+        inverted.close()
+    except (OSError, IOError, ValueError):
+        pass
+    inverted = invert_dictionary(open_dictionaries(dictionary))
+    try:
+        write_dictionary(inverted, sources, path)
+        return CompiledDictionary(path)
+    except (OSError, IOError, ValueError):
+        return inverted
+
+
+# ファイル名の先頭の読み
+#   '山口県.txt' -> ['やまぐちけん', 'さんこうけん', ...]
+def get_readings(name, inverted):
+    name = unicodedata.normalize('NFKC', name)
+    readings = []
+
+    def walk(rest, reading, depth):
+        if(len(readings) >= MAX_READINGS):
+            return
+        is_extended = False
+        if((depth > 0) and (rest != '') and is_japanese(rest[0])):
+            # 仮名の連続
+            i = 0
+            while((i < len(rest)) and is_kana(rest[i])):
+                i += 1
+            if(i > 0):
+                walk(rest[i:], reading + to_hiragana(rest[0:i]), depth)
+                is_extended = True
+            # 辞書の語
+            for n in range(min(MAX_WORD_LENGTH, len(rest)), 0, -1):
+                for r in inverted.get(rest[0:n], []):
+                    walk(rest[n:], reading + r, depth - 1)
+                    is_extended = True
+        if((not is_extended) and (reading != '') and
+           (reading not in readings)):
+            readings.append(reading)
+
+    walk(name, '', MAX_WORDS)
+    return readings
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class ReadingIndex:
+    """A class indexing the names in a directory by their readings"""
+
+    def __init__(self, directory, inverted):
+        self.directory = directory
+        entries = set()
+        for name in os.listdir(directory):
+            # ファイル名そのもの（英数字で始まる場合）
+            entries.add((unicodedata.normalize('NFKC', name), name))
+            for r in get_readings(name, inverted):
+                entries.add((r, name))
+        entries = sorted(entries)
+        self.readings = [e[0] for e in entries]
+        self.names = [e[1] for e in entries]
+
+    def lookup_prefix(self, prefix):
+        found = []
+        i = bisect.bisect_left(self.readings, prefix)
+        while((i < len(self.readings)) and
+              self.readings[i].startswith(prefix)):
+            found.append(self.names[i])
+            i += 1
+        return found
+
+    # ローマ字で始まるファイル名（隠しファイルは"."で始まる場合だけ）
+    def lookup(self, key):
+        found = set(self.lookup_prefix(key))
+        for h in romaji_to_hiragana(key):
+            found.update(self.lookup_prefix(h))
+        if(not key.startswith('.')):
+            found = set(n for n in found if not n.startswith('.'))
+        return sorted(found)
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] +
+                  ' -d [dictionary] [directory] [string]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -d <dictionary>       specify migemo-dict')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    args = sys.argv[1:]
+    if((len(args) != 4) or (args[0] != '-d')):
+        sys.exit(2)
+    dictionary = open_dictionaries(args[1])
+    index = ReadingIndex(args[2], invert_dictionary(dictionary))
+    for n in index.lookup(args[3]):
+        print(n)
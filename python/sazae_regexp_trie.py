@@ -0,0 +1,359 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_regexp_trie.py
+# Version:      v02
+# Time-stamp:   <2026.10.18-18:44:51-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# migemoの正規表現（語の選択）を，語のトライにして，共通の接頭辞を
+# くくり出した正規表現に書き換えます。
+#
+# 重複した語は除き，1文字の選択は文字クラス（[...]）にまとめます。
+# 書き換えた正規表現は，pythonのreとgrep -Eのどちらでも使えます。
+# 選択，グループ，文字クラス，"?"以外を含む正規表現や，書き換えて
+# 短くならない正規表現は，そのまま返します。
+#
+# 例：> echo '(山|山形|山口|やま|ヤマ|ﾔﾏ)' | ./sazae_regexp_trie.py
+#     (やま|ヤマ|山[口形]?|ﾔﾏ)
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import os
+import re
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v02'
+META_CHARACTERS = '\\.^$*+?()[]{}|'
+# 文字クラスに入れない文字（reとgrep -Eで扱いが異なる）
+NOT_IN_CLASS = '\\]^-['
+MAX_WORDS = 50000
+# 字句（エスケープ，文字クラス，記号，連続する文字，扱えない文字）
+TOKEN = re.compile('\\\\(.)|\\[([^\\]]*)\\]|([()|?])|'
+                   '([^\\\\()|?\\[.*+{}^$\\]]+)|(.)', re.S)
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 正規表現の特殊文字をエスケープ（reとgrep -Eで共通）
+def escape(s):
+    return ''.join('\\' + c if(c in META_CHARACTERS) else c for c in s)
+
+
+# 語のトライ（語の終わりは''）
+def make_trie(words):
+    trie = {}
+    for w in words:
+        node = trie
+        for c in w:
+            node = node.setdefault(c, {})
+        node[''] = True
+    return trie
+
+
+# トライを正規表現に（正規表現と，1つの要素か否か）
+def trie_to_regexp(node):
+    alternatives = []
+    characters = []
+    for c in sorted(k for k in node if k != ''):
+        child = node[c]
+        if(list(child) == ['']):
+            if(c in NOT_IN_CLASS):
+                alternatives.append(escape(c))
+            else:
+                characters.append(c)
+        else:
+            r, _ = trie_to_regexp(child)
+            alternatives.append(escape(c) + r)
+    if(len(characters) == 1):
+        alternatives.append(escape(characters[0]))
+    elif(len(characters) > 1):
+        alternatives.append('[' + ''.join(characters) + ']')
+    if(len(alternatives) == 0):
+        return '', True
+    if(len(alternatives) == 1):
+        r = alternatives[0]
+        is_atom = (len(characters) > 1) or (len(r) == 1) or \
+            ((len(r) == 2) and (r[0] == '\\'))
+    else:
+        r = '(' + '|'.join(alternatives) + ')'
+        is_atom = True
+    if('' in node):
+        # ここで終わる語がある
+        if(not is_atom):
+            r = '(' + r + ')'
+        r = r + '?'
+        is_atom = False
+    return r, is_atom
+
+
+# 語の選択を1つのグループの正規表現に
+#   ['山', '山形', '山口'] -> '(山[口形]?)'
+def build(words):
+    words = set(words)
+    if(len(words) == 0):
+        return ''
+    r, is_atom = trie_to_regexp(make_trie(words))
+    if(is_atom and r.startswith('(')):
+        return r
+    return '(' + r + ')'
+
+
+############################################################
+# CLASS
+############################################################
+
+
+class Unsupported(Exception):
+    pass
+
+
+class Parser:
+    """A class parsing a migemo regexp into a tree
+
+    ('alt', [...])，('seq', [...])，('opt', node)，('set', characters)，
+    ('str', 連続する文字)
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        # 連続する文字を1つの字句にして，字句の数を減らす
+        self.tokens = [(m.lastindex, m.group(m.lastindex))
+                       for m in TOKEN.finditer(pattern)]
+        self.pos = 0
+
+    # 次の字句（'(', ')', '|', '?', 文字等なら'atom', 終わりなら''）
+    def peek(self):
+        if(self.pos < len(self.tokens)):
+            kind, value = self.tokens[self.pos]
+            return value if(kind == 3) else 'atom'
+        return ''
+
+    def parse(self):
+        tree = self.parse_alternation()
+        if(self.pos != len(self.tokens)):
+            raise Unsupported(self.pattern)
+        return tree
+
+    def parse_alternation(self):
+        branches = [self.parse_sequence()]
+        while(self.peek() == '|'):
+            self.pos += 1
+            branches.append(self.parse_sequence())
+        return ('alt', branches)
+
+    def parse_sequence(self):
+        atoms = []
+        while(self.peek() not in ['', '|', ')']):
+            atom = self.parse_atom()
+            if(self.peek() == '?'):
+                self.pos += 1
+                if(atom[0] == 'str'):
+                    # "?"は最後の文字だけにかかる
+                    if(len(atom[1]) > 1):
+                        atoms.append(('str', atom[1][0:-1]))
+                    atom = ('str', atom[1][-1])
+                atom = ('opt', atom)
+            atoms.append(atom)
+        return ('seq', atoms)
+
+    def parse_atom(self):
+        kind, value = self.tokens[self.pos]
+        self.pos += 1
+        if(kind == 1):
+            if(value.isalnum()):
+                raise Unsupported(self.pattern)  # \dや\w等
+            return ('str', value)
+        if(kind == 2):
+            return ('set', self.parse_class(value))
+        if(kind == 4):
+            return ('str', value)
+        if((kind == 3) and (value == '(')):
+            tree = self.parse_alternation()
+            if(self.peek() != ')'):
+                raise Unsupported(self.pattern)
+            self.pos += 1
+            return tree
+        raise Unsupported(self.pattern)
+
+    def parse_class(self, content):
+        if((content == '') or content.startswith('^')):
+            raise Unsupported(self.pattern)
+        for i, c in enumerate(content):
+            # "\\"はreとgrep -Eで扱いが異なる
+            if((c in '\\[') or
+               ((c == '-') and (i > 0) and (i + 1 < len(content)))):
+                raise Unsupported(self.pattern)  # 範囲等
+        return frozenset(content)
+
+
+############################################################
+# ANALYSIS
+############################################################
+
+
+# 木を語に展開
+def expand(tree):
+    kind, value = tree
+    if(kind in ['set', 'str']):
+        return set(value) if(kind == 'set') else set([value])
+    if(kind == 'opt'):
+        return expand(value) | set([''])
+    if(kind == 'alt'):
+        words = set()
+        for b in value:
+            words.update(expand(b))
+        return words
+    words = set([''])
+    for atom in value:
+        a = expand(atom)
+        if(len(words) * len(a) > MAX_WORDS):
+            raise Unsupported(tree)
+        words = set(w + x for w in words for x in a)
+    return words
+
+
+# 正規表現を語に展開（展開できなければUnsupported）
+def get_words(pattern):
+    return expand(Parser(pattern).parse())
+
+
+# 先頭になり得る文字と，空の文字列に一致するか否か
+def get_first(tree):
+    kind, value = tree
+    if(kind == 'str'):
+        return set([value[0]]), False
+    if(kind == 'set'):
+        return set(value), False
+    if(kind == 'opt'):
+        first, _ = get_first(value)
+        return first, True
+    if(kind == 'alt'):
+        first = set()
+        is_nullable = False
+        for b in value:
+            f, n = get_first(b)
+            first.update(f)
+            is_nullable = is_nullable or n
+        return first, is_nullable
+    first = set()
+    for atom in value:
+        f, n = get_first(atom)
+        first.update(f)
+        if(not n):
+            return first, False
+    return first, True
+
+
+# 必ず先頭にある文字列と，それが全体か否か
+def get_prefix(tree):
+    kind, value = tree
+    if(kind == 'str'):
+        return value, True
+    if(kind == 'set'):
+        if(len(value) == 1):
+            return list(value)[0], True
+        return '', False
+    if(kind == 'opt'):
+        return '', False
+    if(kind == 'alt'):
+        p, is_exact = get_prefix(value[0])
+        for b in value[1:]:
+            if(p == ''):
+                return '', False
+            q, e = get_prefix(b)
+            is_exact = is_exact and e and (q == p)
+            p = os.path.commonprefix([p, q])
+        return p, is_exact
+    p = ''
+    for atom in value:
+        q, is_exact = get_prefix(atom)
+        p = p + q
+        if(not is_exact):
+            return p, False
+    return p, True
+
+
+# 先頭になり得る文字（分からなければNone）
+#   '(山[口形]?|やま)' -> frozenset(['山', 'や'])
+def first_characters(pattern):
+    try:
+        first, is_nullable = get_first(Parser(pattern).parse())
+    except Unsupported:
+        return None
+    if(is_nullable):
+        return None
+    return frozenset(first)
+
+
+# 一致する文字列が必ず始まる文字列
+#   '(山[口形]?|山梨)' -> '山'
+def required_prefix(pattern):
+    try:
+        p, _ = get_prefix(Parser(pattern).parse())
+    except Unsupported:
+        return ''
+    return p
+
+
+# 語の選択に展開できなければ（短くならなければ），元の正規表現を返す
+def optimize(pattern):
+    if(pattern == ''):
+        return pattern
+    try:
+        words = get_words(pattern)
+    except Unsupported:
+        return pattern
+    r = build(words)
+    if((r in ['', '()']) or (len(r) >= len(pattern))):
+        return pattern
+    return r
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [regexp]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    for line in sys.stdin.read().splitlines():
+        print(optimize(line))
@@ -0,0 +1,310 @@
+#!/usr/bin/python
+# coding: utf-8
+#
+# Name:         ~/.zshrc-sazae/python/sazae_romaji.py
+# Version:      v03
+# Time-stamp:   <2026.10.19-01:52:17-JST>
+#
+# Copyright (C) 2026  Seiichiro HATA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#                                  概要
+#
+# ローマ字を，平仮名，片仮名，半角片仮名に変換します。
+#
+# ヘボン式と訓令式（"shi"と"si"，"tsu"と"tu"等），"n'"（"kan'i"→"かんい"），
+# 促音（"tt"，"tch"），長音（"-"→"ー"，"ō"→"おう"）を扱います。
+# 変換は，ローマ字の表から作った決定性の有限オートマトン（入力の途中の
+# ローマ字を状態とし，1文字ごとに仮名を出力する）で，1文字ずつ表を引くだけです。
+# 末尾が子音で終わる場合は，その子音で始まる仮名に展開します（"matc"は
+# "tch"の途中なので，"まっちゃ"，"まっちゅ"等）。
+# 従来の変換（最長一致）との違いは，sazae_compare_romaji.pyで確かめます。
+#
+# 逆に，平仮名をローマ字（ヘボン式）にも変換します（"-k"）。
+#
+# 仮名だけの正規表現（get_kana_regexp）は，辞書を使わないmigemoです。
+# 漢字を含むファイル名のないディレクトリでは，これで補完します（"-K"）。
+#
+# 例：> ./sazae_romaji.py kon\'nichiha
+#     こんにちは
+#     コンニチハ
+#     ｺﾝﾆﾁﾊ
+
+
+############################################################
+# IMPORT
+############################################################
+
+
+import sys
+import re
+import unicodedata
+
+from sazae_regexp_trie import build
+
+
+############################################################
+# CONSTANT
+############################################################
+
+
+VERSION = 'v03'
+
+# ローマ字と平仮名の対応
+ROMAJI = dict(zip(*[iter('''
+a あ i い u う e え o お
+ka か ki き ku く ke け ko こ kya きゃ kyi きぃ kyu きゅ kye きぇ kyo きょ
+sa さ si し shi し su す se せ so そ sya しゃ syi しぃ syu しゅ sye しぇ syo しょ
+sha しゃ shu しゅ she しぇ sho しょ
+ta た ti ち chi ち tu つ tsu つ te て to と tya ちゃ tyi ちぃ tyu ちゅ tye ちぇ tyo ちょ
+cha ちゃ chu ちゅ che ちぇ cho ちょ cya ちゃ cyi ちぃ cyu ちゅ cye ちぇ cyo ちょ
+tha てゃ thi てぃ thu てゅ the てぇ tho てょ
+na な ni に nu ぬ ne ね no の nya にゃ nyi にぃ nyu にゅ nye にぇ nyo にょ nn ん
+ha は hi ひ hu ふ fu ふ he へ ho ほ hya ひゃ hyi ひぃ hyu ひゅ hye ひぇ hyo ひょ
+fa ふぁ fi ふぃ fe ふぇ fo ふぉ fya ふゃ fyu ふゅ fyo ふょ
+ma ま mi み mu む me め mo も mya みゃ myi みぃ myu みゅ mye みぇ myo みょ
+ya や yu ゆ ye いぇ yo よ
+ra ら ri り ru る re れ ro ろ rya りゃ ryi りぃ ryu りゅ rye りぇ ryo りょ
+la ぁ li ぃ lu ぅ le ぇ lo ぉ lya ゃ lyu ゅ lyo ょ ltu っ ltsu っ lwa ゎ
+xa ぁ xi ぃ xu ぅ xe ぇ xo ぉ xya ゃ xyu ゅ xyo ょ xtu っ xtsu っ xwa ゎ
+xka ゕ xke ゖ xn ん
+wa わ wi うぃ we うぇ wo を
+ga が gi ぎ gu ぐ ge げ go ご gya ぎゃ gyi ぎぃ gyu ぎゅ gye ぎぇ gyo ぎょ
+za ざ zi じ ji じ zu ず ze ぜ zo ぞ zya じゃ zyi じぃ zyu じゅ zye じぇ zyo じょ
+ja じゃ ju じゅ je じぇ jo じょ jya じゃ jyi じぃ jyu じゅ jye じぇ jyo じょ
+da だ di ぢ du づ de で do ど dya ぢゃ dyi ぢぃ dyu ぢゅ dye ぢぇ dyo ぢょ
+dha でゃ dhi でぃ dhu でゅ dhe でぇ dho でょ
+ba ば bi び bu ぶ be べ bo ぼ bya びゃ byi びぃ byu びゅ bye びぇ byo びょ
+pa ぱ pi ぴ pu ぷ pe ぺ po ぽ pya ぴゃ pyi ぴぃ pyu ぴゅ pye ぴぇ pyo ぴょ
+va ゔぁ vi ゔぃ vu ゔ ve ゔぇ vo ゔぉ
+- ー n' ん
+'''.split())] * 2))
+# 長音の記号のある母音（"tōkyō"→"toukyou"）
+LONG_VOWELS = str.maketrans({'ā': 'aa', 'ī': 'ii', 'ū': 'uu', 'ē': 'ee',
+                             'ō': 'ou', 'â': 'aa', 'î': 'ii', 'û': 'uu',
+                             'ê': 'ee', 'ô': 'ou'})
+# 変換の途中の文字列（"ky"等，"tch"の"tc"）
+ROMAJI_PREFIXES = set(k[0:i] for k in ROMAJI
+                      for i in range(1, len(k))) | set(['tc'])
+CONSONANTS = 'bcdfghjklmpqrstvwxyz'
+# 平仮名をローマ字にする場合に，優先するもの（ヘボン式）
+HEPBURN = {'し': 'shi', 'ち': 'chi', 'つ': 'tsu', 'ふ': 'fu', 'じ': 'ji',
+           'しゃ': 'sha', 'しゅ': 'shu', 'しぇ': 'she', 'しょ': 'sho',
+           'ちゃ': 'cha', 'ちゅ': 'chu', 'ちぇ': 'che', 'ちょ': 'cho',
+           'じゃ': 'ja', 'じゅ': 'ju', 'じぇ': 'je', 'じょ': 'jo',
+           'ん': 'n', 'ー': '-'}
+ALPHABET = set(''.join(ROMAJI) + CONSONANTS)
+
+
+############################################################
+# FUNCTIONS
+############################################################
+
+
+# 途中のローマ字sを，途中でなくなるまで変換（仮名と，残りの途中のローマ字）
+def resolve(s):
+    h = ''
+    while((s != '') and (s not in ROMAJI_PREFIXES)):
+        # 促音
+        if(((len(s) > 1) and (s[0] == s[1]) and
+            (s[0] in CONSONANTS) and (s[0] != 'n')) or s.startswith('tch')):
+            h = h + 'っ'
+            s = s[1:]
+            continue
+        for j in range(len(s), 0, -1):
+            if(s[0:j] in ROMAJI):
+                h = h + ROMAJI[s[0:j]]
+                s = s[j:]
+                break
+        else:
+            h = h + ('ん' if(s[0] == 'n') else s[0])
+            s = s[1:]
+    return h, s
+
+
+# 状態（途中のローマ字）と文字から，出力する仮名と次の状態への表
+def make_transitions():
+    transitions = {}
+    for state in ROMAJI_PREFIXES | set(['']):
+        for c in ALPHABET:
+            transitions[(state, c)] = resolve(state + c)
+    return transitions
+
+
+TRANSITIONS = make_transitions()
+
+
+# 入力の途中で終わった場合の展開
+def make_expansions():
+    expansions = {}
+    for state in ROMAJI_PREFIXES:
+        found = []
+        if(state == 'n'):
+            found.append('ん')
+        for k in ROMAJI:
+            if(k.startswith(state) and (ROMAJI[k] not in found)):
+                found.append(ROMAJI[k])
+        if(not found):
+            found = [resolve(state + ' ')[0][0:-1]]
+        expansions[state] = found
+    # "tc"は"tch"の途中（促音と，"c"で始まる仮名）
+    expansions['tc'] = ['っ' + e for e in expansions['c']]
+    return expansions
+
+
+EXPANSIONS = make_expansions()
+
+
+# ローマ字を平仮名に変換
+#   末尾が子音で終わる場合は，その子音で始まる仮名に展開する
+#   'yam' -> ['やま', 'やみ', 'やむ', 'やめ', 'やも', 'やみゃ', ...]
+def romaji_to_hiragana(s):
+    h = ''
+    state = ''
+    for c in s.lower().translate(LONG_VOWELS):
+        t = TRANSITIONS.get((state, c))
+        if(t is None):
+            t = resolve(state + c)
+        h = h + t[0]
+        state = t[1]
+    if(state == ''):
+        return [h]
+    return [h + e for e in EXPANSIONS[state]]
+
+
+# 平仮名 -> ローマ字（小書きの仮名は，単独の場合だけ"x"で始まるもの）
+def make_reverse_table():
+    table = {}
+    for k in sorted(ROMAJI, key=lambda k: (k[0] == 'l', k[0] == 'x',
+                                           len(k), k)):
+        table.setdefault(ROMAJI[k], k)
+    table.update(HEPBURN)
+    return table
+
+
+REVERSE = make_reverse_table()
+
+
+# 平仮名をローマ字に変換（促音は次の子音を重ねる）
+#   'とうきょう' -> 'toukyou'，'まっちゃ' -> 'maccha'，'かんい' -> "kan'i"
+def hiragana_to_romaji(h):
+    r = ''
+    i = 0
+    is_sokuon = False
+    while(i < len(h)):
+        if(h[i] == 'っ'):
+            if(is_sokuon):
+                r = r + 'xtu'
+            is_sokuon = True
+            i += 1
+            continue
+        k = REVERSE.get(h[i:i + 2])
+        n = 2
+        if(k is None):
+            k = REVERSE.get(h[i], h[i])
+            n = 1
+        if(is_sokuon):
+            r = r + (k[0] if(k[0] in CONSONANTS) else 'xtu')
+            is_sokuon = False
+        elif(r.endswith('n') and (k[0] in 'aiueoyn') and
+             (h[i - 1:i] == 'ん')):
+            r = r + "'"  # "かんい" -> "kan'i"
+        r = r + k
+        i += n
+    if(is_sokuon):
+        r = r + 'xtu'
+    return r
+
+
+# 半角片仮名の対応（NFKCの逆）
+def make_half_width_table():
+    table = {'゙': 'ﾞ', '゚': 'ﾟ'}
+    for i in range(0xff61, 0xffa0):
+        h = chr(i)
+        table.setdefault(unicodedata.normalize('NFKC', h), h)
+    # 濁点や半濁点のある片仮名（"ガ"→"ｶﾞ"）
+    for i in range(0x30a1, 0x30fd):
+        k = chr(i)
+        d = unicodedata.normalize('NFD', k)
+        if(len(d) > 1):
+            table.setdefault(k, ''.join(table.get(c, c) for c in d))
+    return table
+
+
+HALF_WIDTH = make_half_width_table()
+
+
+def to_katakana(s):
+    return ''.join(chr(ord(c) + 0x60) if('ぁ' <= c <= 'ゖ') else c
+                   for c in s)
+
+
+def to_half_width(s):
+    return ''.join(HALF_WIDTH.get(c, c) for c in to_katakana(s))
+
+
+def to_full_width(s):
+    return ''.join(chr(ord(c) + 0xfee0) if('!' <= c <= '~') else c
+                   for c in s)
+
+
+# 大文字で区切られていない部分の語（辞書を使わない）
+def get_kana_words(segment):
+    words = [segment, to_full_width(segment)]
+    for h in romaji_to_hiragana(segment):
+        words.extend([h, to_katakana(h), to_half_width(h)])
+    return words
+
+
+# 仮名だけの正規表現（大文字で区切られた部分は，それぞれ変換して連結）
+def get_kana_regexp(key):
+    pattern = ''
+    for segment in re.findall('[A-Z]?[^A-Z]*', key):
+        if(segment != ''):
+            pattern = pattern + build(get_kana_words(segment))
+    return pattern
+
+
+############################################################
+# MAIN
+############################################################
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) == 2):
+        if(sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+            print('Usage: ' + sys.argv[0] + ' [option] [string]')
+            print('Options:')
+            print('  -h, --help            show this message and exit')
+            print('  -v, --version         show version number and exit')
+            print('  -r                    show the regexp')
+            print('  -k                    convert hiragana into romaji')
+            exit(0)
+        elif(sys.argv[1] == '-v' or sys.argv[1] == '--version'):
+            print(sys.argv[0] + ' ' + VERSION)
+            exit(0)
+    args = sys.argv[1:]
+    if((len(args) == 2) and (args[0] == '-r')):
+        print(get_kana_regexp(args[1]))
+        sys.exit(0)
+    if((len(args) == 2) and (args[0] == '-k')):
+        print(hiragana_to_romaji(args[1]))
+        sys.exit(0)
+    if(len(args) != 1):
+        sys.exit(2)
+    for h in romaji_to_hiragana(args[0]):
+        print(h)
+        print(to_katakana(h))
+        print(to_half_width(h))